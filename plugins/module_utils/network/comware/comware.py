@@ -20,23 +20,45 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import copy
 import json
+import re
+import time
 
-from ansible.module_utils._text import to_text
+from ansible.module_utils._text import to_bytes, to_text
 from ansible.module_utils.connection import Connection, ConnectionError
+from ansible.module_utils.six import string_types
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.netconf import (
     NetconfConnection,
 )
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml.namespaces import \
-    NETCONFBASE_C
+    NETCONFBASE_C, NCACTION_C, NCCONFIG_C, NCDATA, NCDATA_C, H3CBASE_C
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.replay import (
+    get_replay_connection, record_connection, recording_path)
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.config_tree import ConfigTree
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.rpc_stats import (
+    RpcStats, rpc_stats_enabled)
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml.lib import (
+    XmlTemplate, data_element_maker, iter_data_rows)
 
 try:
+    from lxml import etree
     from lxml.etree import tostring as xml_to_string
     HAS_LXML = True
 except ImportError:
+    from xml.etree import ElementTree as etree
     from xml.etree.ElementTree import tostring as xml_to_string
     HAS_LXML = False
 
+# rows requested per get-bulk RPC by Device.get_bulk
+DEFAULT_BULK_PAGE_SIZE = 1000
+
+# filter of the ifIndex <-> interface name maps
+_IFACE_MAP_FILTER = XmlTemplate(
+    '<top xmlns="' + NCDATA + '"><Ifmgr><Interfaces><Interface>'
+    '<IfIndex/><Name/>'
+    '</Interface></Interfaces></Ifmgr></top>')
+
 
 def _strip_return(text):
     """Strip excess return characters from text.
@@ -61,6 +83,40 @@ class Device(object):
         self.module = module
         self.connection = get_connection(module)
 
+        # ifIndex <-> interface name maps shared by all feature classes,
+        # filled lazily by a single get of the Ifmgr/Interfaces table
+        self._iface_index_map = None
+        self._iface_name_map = None
+
+        # parsed 'display current-configuration', shared by the features
+        # that read CLI configuration, dropped by every config change
+        self._running_config = None
+
+        # RPCs sent, recorded only when rpc_stats_enabled()
+        self.rpc_stats = None
+        if rpc_stats_enabled():
+            self._enable_rpc_stats()
+
+    def _enable_rpc_stats(self):
+        """Record every RPC in ``self.rpc_stats`` and add its summary
+        to the module result as ``rpc_stats``. The stats are kept on the
+        module, like the connection, so they cover every Device of a run.
+        """
+        module = self.module
+        stats = getattr(module, '_comware_rpc_stats', None)
+        if stats is None:
+            stats = module._comware_rpc_stats = RpcStats()
+
+            def with_stats(result_func):
+                def wrapper(**kwargs):
+                    kwargs.setdefault('rpc_stats', stats.summary())
+                    return result_func(**kwargs)
+                return wrapper
+
+            module.exit_json = with_stats(module.exit_json)
+            module.fail_json = with_stats(module.fail_json)
+        self.rpc_stats = stats
+
     def stage_config(self, config, cfg_type):
         """Append config object to the staging area.
 
@@ -102,7 +158,7 @@ class Device(object):
 
         return cfgs
 
-    def execute_staged(self, target='running'):
+    def execute_staged(self, target='running', coalesce=True):
         """Execute/Push the XML object(s) or CLI strings in the staging
         area (self.staged) to the device.
         Args:
@@ -111,15 +167,24 @@ class Device(object):
                 if supports candidate configurations, etc.
                 Only used for 'edit_config' API calls.
                 Defaults to 'running'.
+            coalesce (bool): whether adjacent 'edit_config' stages and
+                adjacent 'cli_config' stages are merged into as few RPCs
+                as possible, see ``_coalesce_staged``. Defaults to True.
         Returns:
-            A list of responses received from the device.
+            A list of responses received from the device, one per
+            staged entry. 'edit_config' entries that were merged into
+            one RPC share its response, and 'cli_config' entries that
+            were batched get their own slice of the CLI output.
             Responses with CLI information are extracted from the XML
             response.
         """
+        if coalesce:
+            commands = self._coalesce_staged()
+        else:
+            commands = [(cmd['cfg_type'], cmd['config'], [cmd['config']]) for cmd in self.staged]
+
         rsps = []
-        for command in self.staged:
-            cfg_type = command['cfg_type']
-            config = command['config']
+        for cfg_type, config, stages in commands:
             args = []
             kwargs = {}
             if cfg_type == 'edit_config':
@@ -131,59 +196,458 @@ class Device(object):
             elif cfg_type == 'rollback':
                 run_cmd_func, args = self.rollback, [config]
             elif cfg_type == 'cli_config':
+                if len(stages) > 1:
+                    rsps.extend(self._cli_config_batch(stages))
+                    continue
                 run_cmd_func, args = self.cli_config, [config]
             elif cfg_type == 'cli_display':
                 run_cmd_func, args = self.cli_display, [config]
             else:
                 continue
-            rsps.append(run_cmd_func(*args, **kwargs))
+            rsps.extend([run_cmd_func(*args, **kwargs)] * len(stages))
 
         del self.staged[:]
         return rsps
 
+    def _coalesce_staged(self):
+        """Merge runs of adjacent 'edit_config' stages into single
+        ``<config><top>`` documents, and runs of adjacent 'cli_config'
+        stages into single CLI batches.
+
+        Rows are only merged into a document if that doesn't change the
+        order in which the device applies them: a stage joins the current
+        document when each of its tables is either the last table of the
+        document or a table the document doesn't hold yet, when the
+        operation attributes of top, module and table elements match,
+        and when none of its rows shares an index-like leaf (IfIndex, ID,
+        GroupId, Name...) with a row already in that table, so no entry
+        is changed twice in one RPC. Any other stage type is a barrier.
+
+        Returns:
+            A list of (cfg_type, config, stages) tuples, where stages
+            lists the staged configs the command stands for.
+        """
+        commands = []
+        merged = None
+        cli_stages = []
+        for cmd in self.staged:
+            cfg_type = cmd['cfg_type']
+            config = cmd['config']
+            if cfg_type == 'edit_config':
+                parts = _edit_config_parts(config)
+                if parts is not None:
+                    if cli_stages:
+                        commands.append(('cli_config', cli_stages[0], cli_stages))
+                        cli_stages = []
+                    if merged is not None and merged.add(config, parts):
+                        continue
+                    if merged is not None:
+                        commands.append(merged.command())
+                    merged = _MergedEditConfig(config, parts)
+                    continue
+            if merged is not None:
+                commands.append(merged.command())
+                merged = None
+            if cfg_type == 'cli_config':
+                cli_stages.append(config)
+                continue
+            if cli_stages:
+                commands.append(('cli_config', cli_stages[0], cli_stages))
+                cli_stages = []
+            commands.append((cfg_type, config, [config]))
+
+        if merged is not None:
+            commands.append(merged.command())
+        if cli_stages:
+            commands.append(('cli_config', cli_stages[0], cli_stages))
+
+        return commands
+
+    def _cli_config_batch(self, stages):
+        """Send several staged CLI configurations as one
+        ``<CLI><Configuration>`` RPC.
+
+        Stages are separated by commands that return to system view,
+        so each stage starts from the same view as if sent alone.
+
+        Returns:
+            A list with the part of the CLI output produced by each stage.
+
+        Raises:
+            ConnectionError: if the RPC fails. The message names the
+                stage whose commands were being run when it failed.
+        """
+        commands = []
+        for index, stage in enumerate(stages):
+            if index:
+                commands.extend(_CLI_STAGE_SEPARATOR)
+            commands.extend(_cli_lines(stage))
+
+        try:
+            text = self.cli_config(commands)
+        except ConnectionError as exc:
+            msg = to_text(exc, errors='surrogate_then_replace')
+            dummy, failed = _split_cli_output(msg, stages)
+            if failed is None:
+                raise
+            raise ConnectionError('{0} (staged CLI configuration {1} of {2}: {3})'.format(
+                msg, failed + 1, len(stages), '; '.join(_cli_lines(stages[failed]))))
+
+        outputs, dummy = _split_cli_output(text, stages)
+        return outputs
+
     def edit_config(self, config, target='running'):
         """Send a NETCONF edit_config XML object to the device.
         Args:
-            config: xml text sent to ncclient.manager.edit_config
+            config: xml object, or xml text such as an
+                ``XmlTemplate`` fill, sent to ncclient.manager.edit_config
             target: Name of configuration on the remote device. Defaults to 'running'
         Returns:
             The xml text returned from ncclient.manager.edit_config
         """
-        xml_str = xml_to_string(config, encoding='unicode')
-        rsp = self.connection.edit_config(xml_str, target)
+        xml_str = _xml_text(config)
+        self.invalidate_running_config()
+        rsp = self._rpc('edit_config', xml_str, target)
+        if self._touches_iface_table(config):
+            self.invalidate_iface_map()
         return rsp
 
     def get(self, get_tuple=None):
         rsp = None
         if get_tuple and len(get_tuple) == 2:
             get_list = list(get_tuple)
-            get_list[1] = xml_to_string(get_list[1], encoding='unicode')
-            rsp = self.connection.get(get_list)
+            get_list[1] = _xml_text(get_list[1])
+            rsp = self._rpc('get', get_list)
         return rsp
 
+    def get_many(self, get_tuples):
+        """Send several subtree gets as one NETCONF get.
+
+        The ``top`` elements of the filters are merged into a single
+        ``top`` filter, one RPC is sent, and the reply is split back
+        so that each filter gets a reply holding only its own tables.
+        Filters that select the same table with different contents
+        can't share one RPC, so they are sent in further RPCs.
+
+        Args:
+            get_tuples (list): ('subtree', etree.Element) tuples,
+                as passed to ``get``.
+
+        Returns:
+            A list of replies in the same order as ``get_tuples``.
+        """
+        if len(get_tuples) == 1:
+            return [self.get(get_tuples[0])]
+
+        # each batch maps (module tag, table tag) -> serialized table filter
+        batches = []
+        batch_of = []
+        for get_tuple in get_tuples:
+            tables = self._filter_tables(get_tuple[1])
+            for batch in batches:
+                if self._tables_compatible(batch['tables'], tables):
+                    break
+            else:
+                batch = {'tables': {}, 'elements': []}
+                batches.append(batch)
+            for key, (xml, table) in tables.items():
+                if key not in batch['tables']:
+                    batch['tables'][key] = xml
+                    batch['elements'].append((key, table))
+            batch_of.append((batch, list(tables)))
+
+        for batch in batches:
+            E = data_element_maker()
+            top = E.top()
+            modules = {}
+            for (module_tag, dummy), table in batch['elements']:
+                module = modules.get(module_tag)
+                if module is None:
+                    module = modules[module_tag] = etree.SubElement(top, module_tag)
+                if table is not None:
+                    module.append(copy.deepcopy(table))
+            batch['reply'] = self.get((get_tuples[0][0], top))
+
+        return [self._split_reply(batch['reply'], keys) for batch, keys in batch_of]
+
+    @staticmethod
+    def _filter_tables(top):
+        """Return the tables selected by a top filter element as
+        (module tag, table tag) -> (serialized table, table element).
+        """
+        tables = {}
+        for module in top:
+            if len(module) == 0:
+                tables[(module.tag, None)] = ('', None)
+            for table in module:
+                tables[(module.tag, table.tag)] = (xml_to_string(table, encoding='unicode'), table)
+        return tables
+
+    @staticmethod
+    def _tables_compatible(batch_tables, tables):
+        """Return whether the tables of a filter can be merged
+        into a batch without changing what either one selects.
+        """
+        for key, (xml, dummy) in tables.items():
+            if batch_tables.get(key, xml) != xml:
+                return False
+            module_tag, table_tag = key
+            for batch_module, batch_table in batch_tables:
+                # a whole-module selection can't share the module
+                # with a selection of some of its tables
+                if batch_module == module_tag and (batch_table is None) != (table_tag is None):
+                    return False
+        return True
+
+    @staticmethod
+    def _split_reply(reply, keys):
+        """Build a reply holding only the given (module, table)
+        parts of a merged get reply.
+        """
+        if reply is None:
+            return None
+
+        if reply.tag == NCDATA_C + 'top':
+            reply_top = reply
+        else:
+            reply_top = reply.find('.//' + NCDATA_C + 'top')
+
+        E = data_element_maker()
+        top = E.top()
+        part = etree.Element(reply.tag, nsmap=reply.nsmap)
+        part.append(top)
+        if reply_top is None:
+            return part
+
+        modules = {}
+        for module_tag, table_tag in keys:
+            reply_module = reply_top.find(module_tag)
+            if reply_module is None:
+                continue
+            module = modules.get(module_tag)
+            if module is None:
+                module = modules[module_tag] = etree.SubElement(top, module_tag)
+            if table_tag is None:
+                for table in reply_module:
+                    module.append(copy.deepcopy(table))
+            else:
+                table = reply_module.find(table_tag)
+                if table is not None:
+                    module.append(copy.deepcopy(table))
+
+        return part
+
+    def get_raw(self, get_tuple=None):
+        """Send a NETCONF get and return the reply as unparsed bytes.
+
+        Used by ``iter_rows`` so that large replies can be decoded
+        incrementally instead of as one full tree.
+        """
+        rsp = None
+        if get_tuple and len(get_tuple) == 2:
+            get_list = list(get_tuple)
+            get_list[1] = _xml_text(get_list[1])
+            rsp = self._rpc_raw('get', get_list)
+        return rsp
+
+    def _rpc_raw(self, name, *args):
+        """Run an RPC of the connection plugin and return its
+        result as unparsed bytes, raising on RPC errors the same
+        way the connection does.
+        """
+        return self._exec_rpc(name, *args)[0]
+
+    def _exec_rpc(self, name, *args):
+        """Run an RPC of the connection plugin, recording it in
+        ``rpc_stats`` if enabled.
+
+        Returns:
+            A (reply, entry) tuple: the result as unparsed bytes, None
+            on an RPC error that is only a warning, and the ``RpcStats``
+            entry of the call, None if stats are not recorded.
+
+        Raises:
+            ConnectionError: if the connection is not netconf, as other
+                connections have neither the NETCONF RPCs nor
+                ``parse_rpc_error``.
+        """
+        if not isinstance(self.connection, NetconfConnection):
+            raise ConnectionError(
+                'NETCONF RPC {0} needs a netconf connection, '
+                'set ansible_connection to ansible.netcommon.netconf'.format(name))
+
+        # the connection's own RPC methods set these before checking errors
+        self.connection.check_rc = True
+        self.connection.ignore_warning = True
+
+        start = time.time()
+        response = self.connection._exec_jsonrpc(name, *args)
+        wall_time = time.time() - start
+
+        if 'error' in response:
+            reply = to_bytes(response['error'].get('data'), errors='surrogate_then_replace')
+        else:
+            reply = to_bytes(response['result'], errors='surrogate_then_replace')
+
+        entry = None
+        if self.rpc_stats is not None:
+            entry = self.rpc_stats.record(name, wall_time, len(to_bytes(json.dumps(args))), len(reply))
+
+        if 'error' in response:
+            self.connection.parse_rpc_error(reply)
+            return None, entry
+        return reply, entry
+
+    def _rpc(self, name, *args):
+        """Run an RPC of the connection plugin and return the parsed reply.
+
+        Without ``rpc_stats`` this is the connection's own method. With
+        it, the reply is fetched as bytes and parsed here so that wall
+        time, sizes and parse time are recorded separately.
+        """
+        if self.rpc_stats is None:
+            return getattr(self.connection, name)(*args)
+
+        if not isinstance(self.connection, NetconfConnection):
+            start = time.time()
+            rsp = getattr(self.connection, name)(*args)
+            reply_bytes = len(to_bytes(rsp)) if isinstance(rsp, (str, bytes)) else 0
+            self.rpc_stats.record(name, time.time() - start,
+                                  len(to_bytes(json.dumps(args))), reply_bytes)
+            return rsp
+
+        reply, entry = self._exec_rpc(name, *args)
+        if reply is None:
+            return None
+        start = time.time()
+        rsp = etree.fromstring(reply)
+        entry['parse_time'] = time.time() - start
+        return rsp
+
+    def iter_rows(self, get_tuple, row_tag, key_map=None, value_map=None):
+        """Send a NETCONF get and yield the rows of the reply one by one.
+
+        Args:
+            get_tuple (tuple): ('subtree', etree.Element) as for ``get``.
+            row_tag (str): XML tag of a table row, e.g. 'Unicast'.
+            key_map (dict): OPTIONAL - dictionary keys to XML tags.
+                Every leaf of a row is returned by tag if not given.
+            value_map (dict): OPTIONAL - XML tags to value mappings.
+
+        Yields:
+            One dictionary per table row. Memory use stays flat
+            regardless of the number of rows.
+        """
+        rsp = self.get_raw(get_tuple)
+        if not rsp:
+            return
+        rows = iter_data_rows(rsp, row_tag, key_map=key_map, value_map=value_map)
+        for row in self._timed_rows(rows):
+            yield row
+
+    def _timed_rows(self, rows):
+        """Yield the rows of a streamed reply, adding the time spent
+        parsing them to the ``rpc_stats`` entry of the last RPC.
+        """
+        if self.rpc_stats is None:
+            for row in rows:
+                yield row
+            return
+
+        entry = self.rpc_stats.calls[-1]
+        while True:
+            start = time.time()
+            try:
+                row = next(rows)
+            except StopIteration:
+                return
+            finally:
+                entry['parse_time'] += time.time() - start
+            yield row
+
+    def get_bulk(self, get_tuple, index, page_size=DEFAULT_BULK_PAGE_SIZE):
+        """Read a whole table in pages of ``page_size`` rows with the
+        Comware get-bulk RPC, yielding the rows as each page arrives.
+
+        Args:
+            get_tuple (tuple): ('subtree', etree.Element). The filter must
+                have the usual top/<Module>/<Table>/<Row> layout; leaves in
+                the row element select the fields to return.
+            index (list): XML tags of the table's index fields,
+                e.g. ['VLANID', 'MacAddress'] for MAC/MacUnicastTable.
+                Each page starts after the index of the last row read.
+            page_size (int): maximum number of rows per RPC.
+
+        Yields:
+            One dictionary per table row, keyed by XML tag.
+        """
+        top = copy.deepcopy(get_tuple[1])
+        try:
+            table = top[0][0]
+            row_filter = table[0]
+        except IndexError:
+            raise ValueError('get_bulk filter must be top/<Module>/<Table>/<Row>')
+
+        row_tag = row_filter.tag.split('}')[-1]
+        table.set(H3CBASE_C + 'count', str(page_size))
+
+        last_index = None
+        while True:
+            filter_list = [get_tuple[0], xml_to_string(top, encoding='unicode')]
+            rsp = self._rpc_raw('get_bulk', filter_list)
+            if not rsp:
+                return
+
+            count = 0
+            last = None
+            for row in self._timed_rows(iter_data_rows(rsp, row_tag)):
+                count += 1
+                last = row
+                yield row
+
+            if count < page_size or last is None:
+                return
+
+            # guard against a device that ignores the continuation index
+            page_index = [last.get(tag) for tag in index]
+            if page_index == last_index:
+                return
+            last_index = page_index
+
+            for tag in index:
+                field = row_filter.find(NCDATA_C + tag)
+                if field is None:
+                    field = etree.SubElement(row_filter, NCDATA_C + tag)
+                field.text = last.get(tag)
+
     def action(self, element):
         xml_str = xml_to_string(element, encoding='unicode')
-        rsp = self.connection.action(xml_str)
+        self.invalidate_running_config()
+        rsp = self._rpc('action', xml_str)
+        if self._touches_iface_table(element):
+            self.invalidate_iface_map()
         return rsp
 
     def save(self, filename=None):
         rsp = None
         try:
-            rsp = self.connection.save(filename)
+            rsp = self._rpc('save', filename)
         except ConnectionError as exc:
             self.module.fail_json(msg=to_text(exc, errors="surrogate_then_replace"))
         return rsp
 
     def rollback(self, filename):
         rsp = None
+        self.invalidate_running_config()
+        self.invalidate_iface_map()
         try:
-            rsp = self.connection.rollback(filename)
+            rsp = self._rpc('rollback', filename)
         except ConnectionError as exc:
             self.module.fail_json(msg=to_text(exc, errors="surrogate_then_replace"))
         return rsp
 
     def cli_display(self, command):
-        rsp = self.connection.cli_display(command)
+        rsp = self._rpc('cli_display', command)
         return self._extract_config(rsp)
 
     def cli_config(self, command):
@@ -193,15 +657,111 @@ class Device(object):
         Returns:
             raw text CLI output
         """
-        rsp = self.connection.cli_config(command)
+        # CLI commands may change any part of the configuration,
+        # including which interfaces exist
+        self.invalidate_running_config()
+        self.invalidate_iface_map()
+        rsp = self._rpc('cli_config', command)
         return self._extract_config(rsp)
 
+    def get_running_config(self):
+        """Return the running configuration as a ``ConfigTree``.
+
+        'display current-configuration' is read and parsed once, then
+        shared by every feature until the configuration is changed
+        through this object.
+        """
+        if self._running_config is None:
+            text = self.cli_display('display current-configuration')
+            self._running_config = ConfigTree(text)
+        return self._running_config
+
+    def invalidate_running_config(self):
+        """Drop the cached running configuration, so the next
+        ``get_running_config`` reads it again.
+        """
+        self._running_config = None
+
     def reboot(self):
         """Attempt an immediate reboot of the device.
 
         """
         self.connection.reboot()
 
+    def _load_iface_map(self):
+        """Fill the ifIndex <-> interface name maps with one get
+        of the whole Ifmgr/Interfaces table.
+        """
+        top = _IFACE_MAP_FILTER.fill()
+
+        index_map = {}
+        name_map = {}
+        for row in self.iter_rows(('subtree', top), 'Interface'):
+            index = row.get('IfIndex')
+            name = row.get('Name')
+            if index is None or name is None:
+                continue
+            index_map[name] = index
+            name_map[index] = name
+
+        self._iface_index_map = index_map
+        self._iface_name_map = name_map
+
+    def get_iface_index_map(self):
+        """Return a dictionary mapping interface names to ifIndex values.
+
+        The map is fetched once per session and shared by all feature
+        classes. It must be treated as read-only.
+        """
+        if self._iface_index_map is None:
+            self._load_iface_map()
+        return self._iface_index_map
+
+    def get_iface_name_map(self):
+        """Return a dictionary mapping ifIndex values to interface names.
+
+        The map is fetched once per session and shared by all feature
+        classes. It must be treated as read-only.
+        """
+        if self._iface_name_map is None:
+            self._load_iface_map()
+        return self._iface_name_map
+
+    def get_iface_index(self, name):
+        """Return the ifIndex of an interface name,
+        or the empty string if the interface doesn't exist.
+        """
+        return self.get_iface_index_map().get(name, '')
+
+    def get_iface_name(self, index):
+        """Return the interface name of an ifIndex,
+        or None if there is no such interface.
+        """
+        return self.get_iface_name_map().get(str(index))
+
+    def invalidate_iface_map(self):
+        """Drop the cached ifIndex <-> interface name maps.
+
+        Must be called whenever a logical interface or sub interface
+        is created or removed, so the next lookup refetches the table.
+        """
+        self._iface_index_map = None
+        self._iface_name_map = None
+
+    @staticmethod
+    def _touches_iface_table(element):
+        """Return whether an action or config element creates or
+        removes interfaces, i.e. changes the ifIndex <-> name maps.
+        """
+        if isinstance(element, string_types):
+            return 'LogicInterfaces' in element or 'NewSubInterfaces' in element
+        if not hasattr(element, 'iter'):
+            return False
+        for dummy in element.iter(NCACTION_C + 'LogicInterfaces',
+                                  NCCONFIG_C + 'NewSubInterfaces'):
+            return True
+        return False
+
     @staticmethod
     def _extract_config(xml_resp):
         """Extract a CLI response from an XML object.
@@ -237,6 +797,191 @@ class Device(object):
             return ""
 
 
+# sent between batched CLI stages to get back to system view
+_CLI_STAGE_SEPARATOR = ['return', 'system-view']
+
+# prompt in front of an echoed command, e.g. "[HOST-vlan10]" or "<HOST>"
+_CLI_PROMPT_RE = re.compile(r'^\s*(\[[^\]]*\]|<[^>]*>)')
+
+
+def _cli_lines(config):
+    if isinstance(config, list):
+        return [line for line in config if line.strip()]
+    return [line for line in config.split('\n') if line.strip()]
+
+
+def _split_cli_output(text, stages):
+    """Attribute the lines of the output of a batched CLI configuration
+    to the stages that produced them, by following the command echoes.
+
+    Returns:
+        A tuple of the list of output texts, one per stage, and the
+        index of the last stage whose commands were echoed (None if
+        no echo was found).
+    """
+    expected = []
+    for index, stage in enumerate(stages):
+        if index:
+            expected.extend((cmd, None) for cmd in _CLI_STAGE_SEPARATOR)
+        expected.extend((cmd.strip(), index) for cmd in _cli_lines(stage))
+
+    outputs = [[] for dummy in stages]
+    pos = 0
+    current = 0
+    last_echoed = None
+    for line in (text or '').splitlines():
+        echo = _CLI_PROMPT_RE.sub('', line).strip()
+        # look a few commands ahead, in case an echo went missing
+        for ahead in range(pos, min(pos + 8, len(expected))):
+            if echo == expected[ahead][0]:
+                pos = ahead + 1
+                current = expected[ahead][1]
+                if current is not None:
+                    last_echoed = current
+                break
+        if current is not None:
+            outputs[current].append(line)
+
+    return ['\n'.join(lines) for lines in outputs], last_echoed
+
+
+def _edit_config_parts(config):
+    """Split an edit-config document into its tables.
+
+    Returns:
+        A list of (module, table) element tuples, or None if the
+        document doesn't have the plain config/top/<Module>/<Table>/<Row>
+        layout and so can't be merged with others.
+    """
+    if not hasattr(config, 'tag') or config.tag != NETCONFBASE_C + 'config' or len(config) != 1:
+        return None
+    top = config[0]
+    if top.tag != NCCONFIG_C + 'top' or len(top) == 0:
+        return None
+
+    parts = []
+    for module in top:
+        if len(module) == 0:
+            return None
+        for table in module:
+            if len(table) == 0:
+                return None
+            parts.append((module, table))
+    return parts
+
+
+def _element_key(element):
+    return element.tag, tuple(sorted(element.attrib.items()))
+
+
+# leaves with these tag suffixes are taken as (part of) a row's index
+_INDEX_TAG_SUFFIXES = ('ID', 'Id', 'Index', 'Name', 'Number', 'Num')
+
+
+def _row_index(row):
+    """Return the index-like (tag, text) leaves of a config row.
+    Two rows sharing any of them may address the same entry.
+    """
+    return set((leaf.tag, leaf.text) for leaf in row
+               if isinstance(leaf.tag, str) and leaf.tag.endswith(_INDEX_TAG_SUFFIXES))
+
+
+class _MergedEditConfig(object):
+    """An edit-config document built from several staged ones."""
+
+    def __init__(self, config, parts):
+        self.config = config
+        self.stages = [config]
+        self.copied = False
+        self.top_key = _element_key(config[0])
+        self.last_key = None
+        self.tables = {}
+        self._register(parts)
+
+    def _register(self, parts):
+        for module, table in parts:
+            key = (_element_key(module), _element_key(table))
+            indexes = self.tables.setdefault(key, (module, table, set()))[2]
+            for row in table:
+                indexes.update(_row_index(row))
+            self.last_key = key
+
+    def add(self, config, parts):
+        """Merge another config's tables into this one.
+
+        Returns:
+            False, leaving this document untouched, if the
+            tables can't be merged without reordering rows.
+        """
+        if _element_key(parts[0][0].getparent()) != self.top_key:
+            return False
+
+        last_key = self.last_key
+        modules = set(key[0][0] for key in self.tables)
+        seen = set()
+        for module, table in parts:
+            key = (_element_key(module), _element_key(table))
+            if key in seen:
+                return False
+            seen.add(key)
+            if key in self.tables:
+                if key != last_key:
+                    return False
+                indexes = self.tables[key][2]
+                for row in table:
+                    row_index = _row_index(row)
+                    if not row_index or row_index & indexes:
+                        return False
+            elif key[0][0] in modules and key[0] != last_key[0]:
+                # the module is already there, but not last
+                # or with other operation attributes
+                return False
+            modules.add(key[0][0])
+            last_key = key
+
+        if not self.copied:
+            self.config = copy.deepcopy(self.config)
+            self.tables = {}
+            self._register(_edit_config_parts(self.config))
+            self.copied = True
+
+        top = self.config[0]
+        for module, table in parts:
+            key = (_element_key(module), _element_key(table))
+            if key in self.tables:
+                merged_table = self.tables[key][1]
+                for row in table:
+                    merged_table.append(copy.deepcopy(row))
+            else:
+                last_module = top[-1]
+                if _element_key(last_module) == key[0]:
+                    merged_module = last_module
+                else:
+                    merged_module = etree.SubElement(top, module.tag, attrib=dict(module.attrib))
+                merged_table = copy.deepcopy(table)
+                merged_module.append(merged_table)
+                self.tables[key] = (merged_module, merged_table, set())
+            indexes = self.tables[key][2]
+            for row in table:
+                indexes.update(_row_index(row))
+            self.last_key = key
+
+        self.stages.append(config)
+        return True
+
+    def command(self):
+        return 'edit_config', self.config, self.stages
+
+
+def _xml_text(xml):
+    """Return the text of an XML object, or the
+    XML text itself if it is already serialized.
+    """
+    if isinstance(xml, string_types):
+        return xml
+    return xml_to_string(xml, encoding='unicode')
+
+
 def tostring(element, encoding="UTF-8", pretty_print=False):
     if HAS_LXML:
         return xml_to_string(
@@ -254,6 +999,12 @@ def tostring(element, encoding="UTF-8", pretty_print=False):
 def get_connection(module):
     if hasattr(module, "_comware_connection"):
         return module._comware_connection
+    replay = get_replay_connection()
+    if replay is not None:
+        # a recording stands in for the device, see replay.py
+        module._comware_connection = replay
+        return module._comware_connection
+
     capabilities = get_capabilities(module)
     network_api = capabilities.get("network_api")
     if network_api == "cliconf":
@@ -263,6 +1014,9 @@ def get_connection(module):
     else:
         module.fail_json(msg="Invalid connection type %s" % network_api)
 
+    path = recording_path()
+    if path:
+        record_connection(module._comware_connection, path)
     return module._comware_connection
 
 
@@ -271,7 +1025,13 @@ def get_capabilities(module):
         return module._comware_capabilities
     capabilities = None
     try:
-        capabilities = Connection(module._socket_path).get_capabilities()
+        connection = get_replay_connection()
+        if connection is None:
+            connection = Connection(module._socket_path)
+            path = recording_path()
+            if path:
+                record_connection(connection, path)
+        capabilities = connection.get_capabilities()
     except ConnectionError as exc:
         module.fail_json(msg=to_text(exc, errors="surrogate_then_replace"))
     module._comware_capabilities = json.loads(capabilities)
@@ -8,7 +8,7 @@ from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.f
     InterfaceTypeError, InterfaceAbsentError)
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml.lib import reverse_value_map, \
     nc_element_maker, config_element_maker, config_params, operation_kwarg
-from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.interface import Interface
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.interface import LazyInterface
 
 
 class Acl(object):
@@ -69,13 +69,13 @@ class Acl(object):
         # connect to the device and get more information
 
         self.ruleid = rule_id
-        interface = Interface(device, interface_name)
+        interface = LazyInterface(device, interface_name)
         self.groupid = acl_id
         self.scripaddr = scripaddr
         self.device = device
         self.interface_name, self.iface_type, subiface_num = interface._iface_type(interface_name)
         # The interface index is needed for most interface NETCONF requests
-        self.iface_index = interface._get_iface_index()
+        self.iface_index = interface.iface_index
         self.iface_exists = True if self.iface_index != 1 else False
 
     def create_acl(self, stage=False, **params):
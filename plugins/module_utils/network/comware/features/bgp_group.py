@@ -3,7 +3,6 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-import re
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.errors import (
     BgpParamsError, InstanceParamsError, GroupParamsError, PeerParamsError, BgpMissParamsError)
 
@@ -19,19 +18,15 @@ class Bgp(object):
 
     def get_config(self):
         existing = []
-        config = self.device.cli_display('display current-configuration | include bgp')
-        bgp_info = config.split('\n')
-        for line in bgp_info[1:]:
-            if re.search(r'^bgp', line):
-                bgp_name = line.split('bgp')[-1].strip(' ')
-                existing.append(bgp_name)
+        config = self.device.get_running_config()
+        for section in config.sections('bgp'):
+            bgp_name = section.line.split('bgp')[-1].strip(' ')
+            existing.append(bgp_name)
         return existing
 
     def get_group_info(self, group):
-        command = 'display current-configuration | include "group {0}"'.format(group)
-        config = self.device.cli_display(command)
-        group_info = config.split('\n')
-        if len(group_info) > 2:
+        config = self.device.get_running_config()
+        if config.include('group {0}'.format(group)):
             return True
         else:
             return False
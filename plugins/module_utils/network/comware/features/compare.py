@@ -3,6 +3,10 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.config_tree import (
+    ConfigTree, diff_config
+)
+
 
 class Compare(object):
     """This class is used to get data and configure a specific File.
@@ -27,23 +31,14 @@ class Compare(object):
             self.result = result
 
     def get_result(self):
+        """Return whether the output of the command matches the expected
+        result file, comparing both as indented sections so that a line
+        only matches the same line in the same section.
+        """
         commands = '{0}'.format(self.cmd)
         res = self.device.cli_display(commands)
-        ele = res.split('\n')
-        element = ele[1:-1]
-
-        alist = []
-        blist = []
-
-        for line in element:
-            line = line.rstrip()
-            if line:
-                alist.append(line)
-        for line in open(self.result, 'r'):
-            line = line.rstrip()
-            if line:
-                blist.append(line)
-        if set(alist) == set(blist):
-            return True
-        else:
-            return False
+
+        with open(self.result, 'r') as result_file:
+            expected = ConfigTree(result_file.read())
+
+        return not diff_config(ConfigTree(res), expected)
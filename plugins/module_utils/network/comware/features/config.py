@@ -5,6 +5,14 @@ __metaclass__ = type
 
 import os
 
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.config_tree import (
+    ConfigTree, diff_config, diff_summary
+)
+
+# titles of the second list returned by Config.compare_config
+COMMANDS_TITLE = 'COMMANDS THAT APPLY THE DIFFS, IN ORDER'
+SWITCH_DIFFS_TITLE = 'FULL DIFFS AS RETURNED BACK FROM SWITCH'
+
 
 class Config(object):
     """This class is used to activate a new running config in real-time.
@@ -20,6 +28,9 @@ class Config(object):
             object.
         filename (str): absolute path to the file that will be compared
             and/or activated on the device.
+        full_diffs_title (str): what the second list returned by
+            ``compare_config`` holds, ``COMMANDS_TITLE`` or
+            ``SWITCH_DIFFS_TITLE``.
 
     """
     def __init__(self, device, filename):
@@ -30,6 +41,7 @@ class Config(object):
         self._switch_response = []
         self._original__diffs = []
         self._diffs = []
+        self.full_diffs_title = COMMANDS_TITLE
 
     def _get__diffs_from_switch(self):
         """Compare switch running config to desired new config file.
@@ -43,14 +55,41 @@ class Config(object):
     def compare_config(self):
         """Compare new config file to the existing current running config
 
+        The local file is parsed and diffed against the device's running
+        configuration section by section. If the file can't be read
+        locally, the device is asked for a 'display diff' instead.
+
         Returns:
             This returns a tuple of two elements that are both lists.
 
-            The first element has a summary of diffs (self._diffs) and
-            the second element is the exact output from the 'display diff'
-            command, but as a list (self._original__diffs).
+            The first element has a summary of diffs (self._diffs), with
+            '+' for lines the file adds and '-' for lines it removes,
+            under the section they belong to. The second element is the
+            ordered list of commands that turns the running config into
+            the file (self._original__diffs), or the output of the
+            'display diff' command, as told by ``full_diffs_title``.
+        """
+        if not os.path.isfile(self.filename):
+            return self._compare_config_on_switch()
+
+        with open(self.filename, 'r') as cfg_file:
+            new_cfg = ConfigTree(cfg_file.read())
+        current_cfg = self.device.get_running_config()
+
+        self._diffs = diff_summary(current_cfg, new_cfg)
+        self._original__diffs = diff_config(current_cfg, new_cfg)
+        self.full_diffs_title = COMMANDS_TITLE
+
+        return self._diffs, self._original__diffs
+
+    def _compare_config_on_switch(self):
+        """Compare new config file to the existing current running config
+        with the 'display diff' command of the device.
+
+        The output is returned as is, not as commands.
         """
         self._diffs = []
+        self.full_diffs_title = SWITCH_DIFFS_TITLE
         new_cfg = []
         current_cfg = []
 
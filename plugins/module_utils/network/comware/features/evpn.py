@@ -95,9 +95,9 @@ class Evpn(object):
         interface = Interface(device, interface_name)
         self.device = device
         self.interface_name, self.iface_type, self.subiface_num = interface._iface_type(interface_name)
-        self.iface_index = interface._get_iface_index()
+        self.iface_index = interface.iface_index
         self.iface_exists = True if self.iface_index != '1' else False
-        self.is_ethernet, self.is_routed = interface._is_ethernet_is_routed()
+        self.is_ethernet, self.is_routed = interface.is_ethernet, interface.is_routed
         if self.interface_name != '':
             if self.subiface_num:
                 if self.is_routed:
@@ -54,16 +54,21 @@ class Facts(object):
                 }
         """
 
+        # the three tables are read with a single get
+        inventory_reply, base_reply, interface_reply = self.device.get_many([
+            ('subtree', self._inventory_top()),
+            ('subtree', self._base_top()),
+            ('subtree', self._interface_list_top()),
+        ])
+
         facts = collections.OrderedDict()
-        facts.update(self._get_inventory())
-        facts.update(self._get_base())
-        facts.update(self._get_interface_list())
+        facts.update(self._get_inventory(inventory_reply))
+        facts.update(self._get_base(base_reply))
+        facts.update(self._get_interface_list(interface_reply))
 
         return facts
 
-    def _get_interface_list(self):
-        """Get interface list that will be added to facts.
-        """
+    def _interface_list_top(self):
         E = self.em
         top = E.top(
             E.Ifmgr(
@@ -75,7 +80,13 @@ class Facts(object):
             )
         )
 
-        nc_get_reply = self.device.get(('subtree', top))
+        return top
+
+    def _get_interface_list(self, nc_get_reply=None):
+        """Get interface list that will be added to facts.
+        """
+        if nc_get_reply is None:
+            nc_get_reply = self.device.get(('subtree', self._interface_list_top()))
 
         intfs_xml = findall_in_data('Name', nc_get_reply)
         interfaces = [intf.text for intf in intfs_xml]
@@ -96,16 +107,7 @@ class Facts(object):
 
         return uptime
 
-    def _get_inventory(self):
-        """Get os, serial number, and model that will be added to facts.
-        """
-        key_map = {
-            'os': 'SoftwareRev',
-            'serial_number': 'SerialNum',
-            'model': 'ModelName',
-            'hardware': 'HardwareRev'
-        }
-
+    def _inventory_top(self):
         E = self.em
         top = E.top(
             E.LLDP(
@@ -118,22 +120,28 @@ class Facts(object):
                 )
             )
         )
-        nc_get_reply = self.device.get(('subtree', top))
 
-        inventory = data_elem_to_dict(nc_get_reply, key_map)
-        inventory['vendor'] = 'test'
+        return top
 
-        return inventory
-
-    def _get_base(self):
-        """Get hostname, localtime, and uptime that will be added to facts.
+    def _get_inventory(self, nc_get_reply=None):
+        """Get os, serial number, and model that will be added to facts.
         """
         key_map = {
-            'hostname': 'HostName',
-            'localtime': 'LocalTime',
-            'uptime': 'Uptime'
+            'os': 'SoftwareRev',
+            'serial_number': 'SerialNum',
+            'model': 'ModelName',
+            'hardware': 'HardwareRev'
         }
 
+        if nc_get_reply is None:
+            nc_get_reply = self.device.get(('subtree', self._inventory_top()))
+
+        inventory = data_elem_to_dict(nc_get_reply, key_map)
+        inventory['vendor'] = 'test'
+
+        return inventory
+
+    def _base_top(self):
         E = self.em
         top = E.top(
             E.Device(
@@ -144,7 +152,20 @@ class Facts(object):
                 )
             )
         )
-        nc_get_reply = self.device.get(('subtree', top))
+
+        return top
+
+    def _get_base(self, nc_get_reply=None):
+        """Get hostname, localtime, and uptime that will be added to facts.
+        """
+        key_map = {
+            'hostname': 'HostName',
+            'localtime': 'LocalTime',
+            'uptime': 'Uptime'
+        }
+
+        if nc_get_reply is None:
+            nc_get_reply = self.device.get(('subtree', self._base_top()))
 
         basefacts = data_elem_to_dict(nc_get_reply, key_map)
         basefacts['uptime'] = self._get_uptime(basefacts.get('uptime', 0))
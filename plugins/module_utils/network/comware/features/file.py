@@ -3,6 +3,9 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.config_tree import (
+    ConfigTree, diff_config, diff_summary
+)
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml.lib import (
     data_element_maker, findall_in_data, action_element_maker)
 
@@ -52,51 +55,33 @@ class File(object):
         filenames = [file_name.text for file_name in file_names]
         return filenames
 
-    def _get__diffs_between_fies(self):
-        """Compare difference between two rollback files
+    def _read_config_file(self, filename):
+        """Return the content of a configuration file on the switch
+        parsed into a ``ConfigTree``
         """
-        cmds = 'display diff configfile {0} configfile {1}'.format(
-            self.filename, self.comparefile)
-
-        # raw string output taken directly from the switch showing the diff
-        self._diff_response = self.device.cli_display(cmds)
+        return ConfigTree(self.device.cli_display('more {0}'.format(filename)))
 
     def compare_rollback_files(self):
-        """Compare new config file to the existing current running config
+        """Compare the rollback file to the file it is compared with
+
+        Both files are read from the switch and diffed locally,
+        section by section.
 
         Returns:
             This returns a tuple of two elements that are both lists.
 
-            The first element has a summary of diffs (self._diffs) and
-            the second element is the exact output from the 'display diff'
-            command, but as a list (self._original__diffs).
+            The first element has a summary of diffs (self._diffs), with
+            '+' for lines only in the compared file and '-' for lines
+            only in the rollback file, under the section they belong to.
+            The second element is the ordered list of commands that
+            turns the rollback file into the compared file
+            (self._original__diffs).
         """
-        self._diffs = []
-        file_cfg = []
-        compare_cfg = []
-
-        if not self._diff_response:
-            self._get__diffs_between_fies()
-
-        # same as _diff_response, but as a list with each line as an element
-        self._original__diffs = self._diff_response.split('\n')
-
-        for line in self._original__diffs:
-            if line.strip().startswith('-') and '#' not in line:
-                file_cfg.append(line.strip('-').strip())
-            elif line.strip().startswith('+') and '#' not in line:
-                compare_cfg.append(line.strip('+').strip())
-
-        commands_to_apply = set(compare_cfg).difference(file_cfg)
-        commands_to_remove = set(file_cfg).difference(compare_cfg)
-
-        # diffs is summary of exactly which lines are changing in
-        # _original__diffs because _diffs from switch show everything
-        for each in commands_to_apply:
-            self._diffs.append('+' + each)
+        file_cfg = self._read_config_file(self.filename)
+        compare_cfg = self._read_config_file(self.comparefile)
 
-        for each in commands_to_remove:
-            self._diffs.append('-' + each)
+        self._diffs = diff_summary(file_cfg, compare_cfg)
+        self._original__diffs = diff_config(file_cfg, compare_cfg)
 
         return self._diffs, self._original__diffs
 
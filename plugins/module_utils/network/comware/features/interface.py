@@ -11,9 +11,50 @@ from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.f
     InterfaceAbsentError, InterfaceParamsError, InterfaceVlanMustExist
 )
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.vlan import Vlan
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.ifname import (
+    IFACE_TYPES, normalize_interface
+)
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml.lib import reverse_value_map, \
     data_element_maker, find_in_data, data_elem_to_dict, nc_element_maker, config_element_maker, \
-    config_params, operation_kwarg, action_element_maker, find_in_action
+    config_params, operation_kwarg, action_element_maker, find_in_action, XmlTemplate
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml.namespaces import NCDATA
+
+
+# per-interface reads, done by every Interface of a run
+_IFACE_INFO_FILTER = XmlTemplate(
+    '<top xmlns="' + NCDATA + '"><Ifmgr><Interfaces><Interface>'
+    '<Name>{name}</Name><IfIndex/><PortLayer/>'
+    '</Interface></Interfaces></Ifmgr></top>')
+
+_IFACE_ROW_FILTER = XmlTemplate(
+    '<top xmlns="' + NCDATA + '"><Ifmgr><Interfaces><Interface>'
+    '<IfIndex>{index}</IfIndex>'
+    '</Interface></Interfaces></Ifmgr></top>')
+
+# dictionary keys to Ifmgr/Interfaces XML tags
+IFACE_KEY_MAP = {
+    'admin': 'AdminStatus',
+    'speed': 'ConfigSpeed',
+    'duplex': 'ConfigDuplex',
+    'description': 'Description',
+    'type': 'PortLayer'
+}
+
+# Ifmgr/Interfaces XML values to dictionary values, by XML tag
+IFACE_VALUE_MAP = {
+    'AdminStatus': {'1': 'up',
+                    '2': 'down'},
+    'ConfigSpeed': {'1': 'auto', '2': '10',
+                    '4': '100', '32': '1000',
+                    '1024': '10000', '4096': '20000',
+                    '8192': '40000', '16384': '100000',
+                    '65536': '25000'},
+    'ConfigDuplex': {'1': 'full',
+                     '2': 'half',
+                     '3': 'auto'},
+    'PortLayer': {'1': 'bridged',
+                  '2': 'routed'}
+}
 
 
 class Interface(object):
@@ -41,39 +82,23 @@ class Interface(object):
             interfaces should always exist. Logical interfaces may
             or may not exist.
         subiface_num (str): Routing sub interface value
+
+    Note:
+        The constructor reads the interface's IfIndex and PortLayer
+        with a single get. Use ``LazyInterface`` to delay that read
+        until one of those attributes is needed.
     """
 
     def __init__(self, device, interface_name):
         # used to map key values from our dictionary model
         # to expected XML tags and vice versa
-        self._key_map = {
-            'admin': 'AdminStatus',
-            'speed': 'ConfigSpeed',
-            'duplex': 'ConfigDuplex',
-            'description': 'Description',
-            'type': 'PortLayer'
-        }
+        self._key_map = IFACE_KEY_MAP
 
         # used to map value values from our dictionary model
         # to expected XML tags and vice versa
-        self._value_map = {
-            'AdminStatus': {'1': 'up',
-                            '2': 'down'},
-            'ConfigSpeed': {'1': 'auto', '2': '10',
-                            '4': '100', '32': '1000',
-                            '1024': '10000', '4096': '20000',
-                            '8192': '40000', '16384': '100000',
-                            '65536': '25000'},
-            'ConfigDuplex': {'1': 'full',
-                             '2': 'half',
-                             '3': 'auto'},
-            'PortLayer': {'1': 'bridged',
-                          '2': 'routed'}
-        }
-
-        self._iface_types = {'FortyGigE', 'Tunnel', 'LoopBack', 'Vlan-interface', 'Vsi-interface', 'Bridge-Aggregation',
-                             'Route-Aggregation', 'GigabitEthernet', 'TwentyGigE', 'Ten-GigabitEthernet', 'HundredGigE',
-                             'Twenty-FiveGigE'}
+        self._value_map = IFACE_VALUE_MAP
+
+        self._iface_types = set(if_type for dummy, if_type in IFACE_TYPES)
 
         # xml tags
         self._iface_row_name = 'Interface'
@@ -86,121 +111,51 @@ class Interface(object):
         self.interface_name, self.iface_type, self.subiface_num = self._iface_type(interface_name)
         self.device = device
         # The interface index is needed for most interface NETCONF requests
-        self.iface_index = self._get_iface_index()
+        self._load_iface_info()
 
-        self.is_ethernet, self.is_routed = self._is_ethernet_is_routed()
+    def _load_iface_info(self):
+        """Set ``iface_index``, ``is_ethernet``, ``is_routed``
+        and ``iface_exists`` from a single get of the interface's row.
+        """
+        self.iface_index, self.is_ethernet, self.is_routed = self._get_iface_info()
         self.iface_exists = True if self.iface_index else False
 
     def _iface_type(self, if_name):
         """Return the normalized interface name and type
         from a denormalized interface name.
         """
-
-        if if_name.lower().startswith('gi'):
-            if_type = 'GigabitEthernet'
-        elif if_name.lower().startswith('ten'):
-            if_type = 'Ten-GigabitEthernet'
-        elif if_name.lower().startswith('fo'):
-            if_type = 'FortyGigE'
-        elif if_name.lower().startswith('vl'):
-            if_type = 'Vlan-interface'
-        elif if_name.lower().startswith('vs'):
-            if_type = 'Vsi-interface'
-        elif if_name.lower().startswith('lo'):
-            if_type = 'LoopBack'
-        elif if_name.lower().startswith('br'):
-            if_type = 'Bridge-Aggregation'
-        elif if_name.lower().startswith('ro'):
-            if_type = 'Route-Aggregation'
-        elif if_name.lower().startswith('tu'):
-            if_type = 'Tunnel'
-        elif if_name.lower().startswith('twentygig'):
-            if_type = 'TwentyGigE'
-        elif if_name.lower().startswith('twenty-fivegig'):
-            if_type = 'Twenty-FiveGigE'
-        elif if_name.lower().startswith('hu'):
-            if_type = 'HundredGigE'
-        else:
-            if_type = None
-
-        number_list = if_name.split(' ')
-        if len(number_list) == 2:
-            iface_num = number_list[-1].strip()
-            sub_num_list = iface_num.split('.')
-            if len(sub_num_list) == 2:
-                sub_num = sub_num_list[-1].strip()
-                number = sub_num_list[0].strip()
-            else:
-                number = sub_num_list[0].strip()
-                sub_num = None
-        else:
-            number, sub_num = self._get_number(if_name)
-
-        if if_type:
-            proper_interface = if_type + number
-        else:
-            proper_interface = if_name
-
-        return proper_interface, if_type, sub_num
-
-    @staticmethod
-    def _get_number(if_name):
-        digits = ''
-        subnumlist = if_name.split('.')
-        if len(subnumlist) == 2:
-            subnum = subnumlist[-1].strip()
-            if_name = subnumlist[0].strip()
-            for char in if_name:
-                if char.isdigit() or char == '/' or char == ':':
-                    digits += char
-        else:
-            for char in if_name:
-                if char.isdigit() or char == '/' or char == ':':
-                    digits += char
-            subnum = None
-        return digits, subnum
+        return normalize_interface(if_name)
 
     def _get_iface_index(self):
         """Return the interface index given the self.interface_name
-        attribute by asking the device. If the interface doesn't exist,
-        return the empty string.
+        attribute from the device's shared ifIndex map. If the interface
+        doesn't exist, return the empty string.
         """
-        E = data_element_maker()
-        top = E.top(
-            E.Ifmgr(
-                E.Interfaces(
-                    E.Interface(
-                        E.Name(self.interface_name)
-                    )
-                )
-            )
-        )
+        return self.device.get_iface_index(self.interface_name)
 
+    def _get_iface_info(self):
+        """Return the interface index, whether the interface is ethernet
+        and whether it is routed, read by name in one get. If the
+        interface doesn't exist, return ('', False, False).
+        """
+        top = _IFACE_INFO_FILTER.fill(name=self.interface_name)
         nc_get_reply = self.device.get(('subtree', top))
-        reply_data = find_in_data(
-            self._iface_index_name, nc_get_reply)
 
-        if reply_data is None:
-            return ''
+        index_reply_data = find_in_data(self._iface_index_name, nc_get_reply)
+        if index_reply_data is None or not index_reply_data.text:
+            return '', False, False
+
+        routed_reply_data = find_in_data('PortLayer', nc_get_reply)
+        port_layer = getattr(routed_reply_data, 'text', None)
 
-        return reply_data.text
+        return index_reply_data.text, port_layer == '1', port_layer == '2'
 
     def _is_ethernet_is_routed(self):
         """Return whether the interface is ethernet and whether
         it is routed. If the interface doesn't exist,
         return False.
         """
-        E = data_element_maker()
-        top = E.top(
-            E.Ifmgr(
-                E.Interfaces(
-                    E.Interface(
-                        E.IfIndex(self.iface_index)
-                    )
-                )
-            )
-        )
-
+        top = _IFACE_ROW_FILTER.fill(index=self.iface_index)
         nc_get_reply = self.device.get(('subtree', top))
         # reply_data = find_in_data('ifType', nc_get_reply)
 
@@ -240,11 +195,10 @@ class Interface(object):
             (``execute()`` on this class's ``device`` object) of
             commands to create an interface.
          """
-        if_index = self._get_iface_index()
-        if not if_index:
+        self.device.invalidate_iface_map()
+        self._load_iface_info()
+        if not self.iface_exists:
             raise InterfaceCreateError(self.interface_name)
-        self.iface_index = if_index
-        self.iface_exists = True
 
     def get_default_config(self):
         """Return the default configuration of an interface.
@@ -313,17 +267,7 @@ class Interface(object):
     def get_config(self):
         """Return the currently configured
         """
-        E = data_element_maker()
-        top = E.top(
-            E.Ifmgr(
-                E.Interfaces(
-                    E.Interface(
-                        E.IfIndex(self.iface_index)
-                    )
-                )
-            )
-        )
-
+        top = _IFACE_ROW_FILTER.fill(index=self.iface_index)
         nc_get_reply = self.device.get(('subtree', top))
         reply_data = find_in_data(self._iface_row_name, nc_get_reply)
 
@@ -628,3 +572,191 @@ class Interface(object):
             return self.device.stage_config(config, 'edit_config')
         else:
             return self.device.edit_config(config)
+
+
+class LazyInterface(Interface):
+    """An ``Interface`` that reads nothing from the device until
+    ``iface_index``, ``is_ethernet``, ``is_routed`` or ``iface_exists``
+    is first accessed, then reads all four with a single get.
+
+    Useful when only the normalized interface name is needed, or
+    when many interfaces are built up front but few are used.
+    """
+
+    _lazy_attrs = frozenset(['iface_index', 'is_ethernet', 'is_routed', 'iface_exists'])
+
+    def _load_iface_info(self):
+        # forget anything read so far, the next access reads it again
+        for name in self._lazy_attrs:
+            self.__dict__.pop(name, None)
+
+    def __getattr__(self, name):
+        if name not in self._lazy_attrs:
+            raise AttributeError(name)
+        Interface._load_iface_info(self)
+        return self.__dict__[name]
+
+
+class Interfaces(object):
+    """This class is used to get and build the configuration
+    of many interfaces at once on ``COM7`` devices.
+
+    Every row of ``Ifmgr/Interfaces`` is read with a single get,
+    and the changes of all interfaces are sent in one edit-config.
+
+    Args:
+        device (COM7): connected instance of a
+            ``phyp.comware.COM7`` object.
+
+    Attributes:
+        device (COM7): connected instance of a
+            ``phyp.comware.COM7`` object.
+    """
+
+    def __init__(self, device):
+        self.device = device
+
+        self._key_map = IFACE_KEY_MAP
+        self._value_map = IFACE_VALUE_MAP
+
+        self._r_key_map = dict(reversed(item) for item in self._key_map.items())
+        self._r_value_map = reverse_value_map(self._r_key_map, self._value_map)
+
+        # the get also returns the name and index of each row
+        self._row_key_map = dict(self._key_map, name='Name', index='IfIndex')
+        self._configs = None
+
+    def _gen_top(self):
+        E = data_element_maker()
+        top = E.top(
+            E.Ifmgr(
+                E.Interfaces(
+                    E.Interface(
+                        E.Name(),
+                        E.IfIndex(),
+                        *[getattr(E, tag)() for tag in self._key_map.values()]
+                    )
+                )
+            )
+        )
+
+        return top
+
+    def get_configs(self):
+        """Return the configuration of every interface.
+
+        The table is read once and kept until ``refresh()``.
+
+        Returns:
+            A dictionary keyed by interface name. Values are
+            dictionaries like ``Interface.get_config()`` returns,
+            plus the interface's 'index'.
+        """
+        if self._configs is None:
+            self._configs = {}
+            for row in self.device.iter_rows(('subtree', self._gen_top()), 'Interface',
+                                             key_map=self._row_key_map,
+                                             value_map=self._value_map):
+                name = row.pop('name', None)
+                if name:
+                    self._configs[name] = row
+        return self._configs
+
+    def refresh(self):
+        """Forget the configurations read so far.
+        """
+        self._configs = None
+
+    def get_config(self, interface_name):
+        """Return the configuration of one interface as
+        ``Interface.get_config()`` does, or an empty dictionary.
+        """
+        config = self.get_configs().get(normalize_interface(interface_name)[0])
+        if config is None:
+            return {}
+        return dict((k, v) for k, v in config.items() if k != 'index')
+
+    def param_check(self, interface_name, **params):
+        """Check given parameters against an interface read by
+        ``get_configs()``, like ``Interface.param_check()``.
+
+        Raises:
+            InterfaceTypeError: if the interface type is unknown.
+            InterfaceAbsentError: if the interface doesn't exist.
+            InterfaceParamsError: if speed or duplex is given for
+                an interface that is not ethernet.
+        """
+        name, iface_type, dummy = normalize_interface(interface_name)
+        if not iface_type:
+            raise InterfaceTypeError(
+                name, list(set(if_type for dummy, if_type in IFACE_TYPES)))
+
+        if name not in self.get_configs():
+            raise InterfaceAbsentError(name)
+
+        if re.search(r'Gig', name) is None:
+            param_names = [key for key in ('speed', 'duplex') if params.get(key)]
+            if param_names:
+                raise InterfaceParamsError(name, param_names)
+
+    def get_deltas(self, proposed):
+        """Return the parameters that differ from the device.
+
+        Args:
+            proposed (dict): desired parameters keyed by interface name
+
+        Returns:
+            A dictionary keyed by normalized interface name of the
+            parameters to change. Interfaces without changes are left out.
+        """
+        deltas = {}
+        for interface_name, params in proposed.items():
+            name = normalize_interface(interface_name)[0]
+            existing = self.get_config(name)
+            delta = dict(set(params.items()).difference(existing.items()))
+            if delta:
+                deltas[name] = delta
+        return deltas
+
+    def build(self, deltas, stage=False):
+        """Stage or execute the configuration of many interfaces
+        as a single edit-config.
+
+        Args:
+            deltas (dict): parameters to set keyed by interface name,
+                see ``Interface.build()`` for the parameters.
+            stage (bool): whether to stage the commands or execute
+                immediately
+
+        Returns:
+            True if stage=True and staging is successful
+            etree.Element XML response if immediate execution
+            False if there is nothing to change
+        """
+        if not deltas:
+            return False
+
+        configs = self.get_configs()
+        EN = nc_element_maker()
+        EC = config_element_maker()
+
+        rows = []
+        for interface_name, params in deltas.items():
+            name = normalize_interface(interface_name)[0]
+            params = dict(params, IfIndex=configs[name]['index'])
+            rows.append(EC.Interface(
+                *config_params(params, self._key_map, value_map=self._r_value_map)))
+
+        config = EN.config(
+            EC.top(
+                EC.Ifmgr(
+                    EC.Interfaces(*rows)
+                )
+            )
+        )
+
+        self.refresh()
+        if stage:
+            return self.device.stage_config(config, 'edit_config')
+        else:
+            return self.device.edit_config(config)
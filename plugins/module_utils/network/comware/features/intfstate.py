@@ -3,6 +3,21 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import re
+
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.comware import get_capabilities
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.ifname import (
+    normalize_interface_full_name
+)
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml.lib import data_element_maker
+
+# AdminStatus/OperStatus values of Ifmgr/Interfaces
+ADMIN_UP = '1'
+OPER_DOWN = '2'
+
+# one row of 'display interface brief': interface name, then link state
+_BRIEF_ROW_RE = re.compile(r'^(\S+)\s+(UP|DOWN|ADM|Stby)\b', re.MULTILINE)
+
 
 class IntfState(object):
     """This class is used to get data and configure a specific File.
@@ -20,76 +35,69 @@ class IntfState(object):
     def __init__(self, device):
         self.device = device
 
+        # dictionary to XML tag mappings
+        self.state_key_map = {
+            'name': 'Name',
+            'admin': 'AdminStatus',
+            'oper': 'OperStatus'
+        }
+
+    @staticmethod
+    def gen_top():
+        E = data_element_maker()
+        top = E.top(
+            E.Ifmgr(
+                E.Interfaces(
+                    E.Interface(
+                        E.Name(),
+                        E.AdminStatus(),
+                        E.OperStatus()
+                    )
+                )
+            )
+        )
+
+        return top
+
+    def _is_cliconf(self):
+        module = self.device.module
+        return get_capabilities(module).get('network_api') == 'cliconf'
+
     def get_result(self):
-        # 获取设备接口列表
-        commands = 'dis interface brief'
-        res = self.device.cli_display(commands)
-
-        res = res.replace('Brief information on interfaces in bridge mode:', '')
-        res = res.replace('Link: ADM - administratively down; Stby - standby', '')
-        res = res.replace('Speed: (a) - auto', '')
-        res = res.replace('Duplex: (a)/A - auto; H - half; F - full', '')
-        res = res.replace('Type: A - access; T - trunk; H - hybrid', '')
-        res = res.replace('Interface            Link Speed     Duplex Type PVID Description', '')
-
-        ele = res.split('\n')
-        element = ele[6:-1]
-        length = len(element)
-        i = 0
-        intfList = []
-        # 获取接口列表
-        while i < length - 1:
-            intf = element[i].split(' ')[0]
-            intfList.append(intf)
-            i += 1
-            if i > length:
-                break
-        list_1 = [i for i in intfList if i != '\r']
-        list_2 = [i for i in list_1 if i != '']  # 接口列表，长度60
-
-        # 获取设备接口列表状态
-        upList = []
-        j = 0
-        while j < length:
-            up = element[j].split(' ')  # 将字符串按照空格切分
-            upList.append(up)
-
-            j += 1
-            if j > length:
-                break
-
-        upLen = len(upList)  # Up列表长度
-
-        m = 0
-        UPlist = []
-        while m < upLen - 1:
-
-            a = [p for p in upList[m] if p != '\r']
-            b = [p for p in a if p != '']
-            UPlist.append(b)
-            m += 1
-            if m > upLen:
-                break
-
-        LIST = [x for x in UPlist if x != []]
-
-        lit = []
-        e = 0
-        while e < len(LIST):
-            lit.append(LIST[e][1])
-            e += 1
-            if e > len(LIST):
-                break
-        # print (lit)#接口状态列表
-
-        # 打印出接口没有shutdown实际却down的索引号
-        down = 'DOWN'
-        a = []
-        for i, v in enumerate(lit):
-            if v == down:
-                a.append(list_2[i])
-
-        if len(a):
-            return a
-        else:
-            return False
+        """Get the interfaces that are administratively up
+        but whose link is down.
+
+        Returns:
+            A list of interface names, in the order of the device,
+            or False if there are none.
+        """
+        if self._is_cliconf():
+            return self._get_result_cli()
+
+        names = []
+        admin_up = set()
+        oper_down = set()
+        for row in self.device.iter_rows(('subtree', self.gen_top()), 'Interface',
+                                         key_map=self.state_key_map):
+            name = row.get('name')
+            names.append(name)
+            if row.get('admin') == ADMIN_UP:
+                admin_up.add(name)
+            if row.get('oper') == OPER_DOWN:
+                oper_down.add(name)
+
+        down = admin_up & oper_down
+        return [name for name in names if name in down] or False
+
+    def _get_result_cli(self):
+        """Same as ``get_result``, parsed from 'display interface brief'
+        for the cliconf transport, which is sent with the cliconf
+        ``get`` RPC. The abbreviated names printed by the device are
+        normalized, so both transports return full names.
+        """
+        res = self.device.connection.get(command='display interface brief')
+
+        down = [normalize_interface_full_name(name)
+                for name, link in _BRIEF_ROW_RE.findall(res)
+                if link == 'DOWN']
+        return down or False
@@ -9,7 +9,7 @@ import ipaddress
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.errors import IpIfaceMissingData
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.interface import Interface
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml.lib import (
-    data_element_maker, findall_in_data, data_elem_to_dict, nc_element_maker, config_element_maker,
+    data_element_maker, findall_in_data, data_elems_to_dicts, nc_element_maker, config_element_maker,
     config_params, operation_kwarg)
 
 V4 = 'v4'
@@ -145,13 +145,8 @@ class IpInterface(object):
         nc_get_reply = self.device.get(('subtree', top))
         reply_data = findall_in_data(search_tag, nc_get_reply)
 
-        existing_list = []
-        for match in reply_data:
-            to_dict = data_elem_to_dict(match, key_map)
-            if to_dict:
-                existing_list.append(to_dict)
-
-        return existing_list
+        return [to_dict for to_dict in data_elems_to_dicts(reply_data, key_map)
+                if to_dict]
 
     def build(self, stage=False, **params):
         """Stage or execute a configuration to configure
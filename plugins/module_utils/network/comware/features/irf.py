@@ -228,15 +228,8 @@ class IrfMember(object):
     def __init__(self, device):
         self.device = device
 
-    def _get_member_config(self, member_id):
-        """Get membership configuration for the specified member ID.
-        Information includes priority, description, and the new member ID.
-        """
-        irf_members = {}
-        key_map = {'new_member_id': 'NewMemberID',
-                   'descr': 'Description',
-                   'priority': 'Priority'}
-
+    @staticmethod
+    def _members_top():
         E = data_element_maker()
         top = E.top(
             E.IRF(
@@ -246,7 +239,31 @@ class IrfMember(object):
             )
         )
 
-        nc_get_reply = self.device.get(('subtree', top))
+        return top
+
+    @staticmethod
+    def _configuration_top():
+        E = data_element_maker()
+        top = E.top(
+            E.IRF(
+                E.Configuration()
+            )
+        )
+
+        return top
+
+    def _get_member_config(self, member_id, nc_get_reply=None):
+        """Get membership configuration for the specified member ID.
+        Information includes priority, description, and the new member ID.
+        """
+        irf_members = {}
+        key_map = {'new_member_id': 'NewMemberID',
+                   'descr': 'Description',
+                   'priority': 'Priority'}
+
+        if nc_get_reply is None:
+            nc_get_reply = self.device.get(('subtree', self._members_top()))
+
         member_eles = findall_in_data('Member', nc_get_reply)
 
         for member_ele in member_eles:
@@ -293,7 +310,7 @@ class IrfMember(object):
 
         return True
 
-    def _get_domain_config(self):
+    def _get_domain_config(self, nc_get_reply=None):
         """Return the domain id of switch or IRF stack.
 
         Returns:
@@ -301,21 +318,15 @@ class IrfMember(object):
         """
         key_map = {'domain_id': 'Domain'}
 
-        E = data_element_maker()
-        top = E.top(
-            E.IRF(
-                E.Configuration()
-            )
-        )
-
-        nc_get_reply = self.device.get(('subtree', top))
+        if nc_get_reply is None:
+            nc_get_reply = self.device.get(('subtree', self._configuration_top()))
         reply_data = find_in_data('Configuration', nc_get_reply)
 
         domain_data = data_elem_to_dict(reply_data, key_map)
 
         return domain_data
 
-    def _get_auto_update_config(self):
+    def _get_auto_update_config(self, nc_get_reply=None):
         """Return whether the IRF auto update feature is enabled.
 
         Returns:
@@ -323,14 +334,8 @@ class IrfMember(object):
         """
         key_map = {'auto_update': 'AutoUpgrade'}
 
-        E = data_element_maker()
-        top = E.top(
-            E.IRF(
-                E.Configuration()
-            )
-        )
-
-        nc_get_reply = self.device.get(('subtree', top))
+        if nc_get_reply is None:
+            nc_get_reply = self.device.get(('subtree', self._configuration_top()))
         reply_data = find_in_data('Configuration', nc_get_reply)
 
         au_data = data_elem_to_dict(reply_data, key_map)
@@ -423,12 +428,18 @@ class IrfMember(object):
         Raises:
             IRFMemberDoesntExistError: if the IRF member doesn't exist.
         """
-        member_config = self._get_member_config(member_id)
+        # members and IRF configuration are read with a single get
+        members_reply, configuration_reply = self.device.get_many([
+            ('subtree', self._members_top()),
+            ('subtree', self._configuration_top()),
+        ])
+
+        member_config = self._get_member_config(member_id, members_reply)
         if member_config is None:
             raise IRFMemberDoesntExistError(member_id)
-        au_config = self._get_auto_update_config()
+        au_config = self._get_auto_update_config(configuration_reply)
         madex_config = self._get_mad_exclude()
-        domain_config = self._get_domain_config()
+        domain_config = self._get_domain_config(configuration_reply)
 
         member_config.update(au_config)
         member_config.update(madex_config)
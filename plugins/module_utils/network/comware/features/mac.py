@@ -1,13 +1,21 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.errors import (
+    InterfaceAbsentError)
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.ifname import (
+    normalize_interface_name)
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml.lib import (
-    data_element_maker, findall_in_data)
+    data_element_maker)
 
 
 class MacUnicastTable(object):
     """This class is used to get MacUnicastTable
 
+    No module of the collection reads the table yet, so the ``vlanID``
+    and ``port`` filters of ``getMacList`` are only available to callers
+    of this API.
+
     Args:
         device (COM7): connected instance of a ``comware.comware.COM7``  object.
 
@@ -15,63 +23,82 @@ class MacUnicastTable(object):
 
     def __init__(self, device):
         self.device = device
-
-    def getMacTableTop(self):
+        self._status_map = {
+            '0': 'Other',
+            '1': 'Security',
+            '2': 'Learned',
+            '3': 'Static',
+            '4': 'Blackhole'
+        }
+
+    def getMacTableTop(self, vlanID=None, portIndex=None):
         """Build XML object for MacTable
 
+        Args:
+            vlanID (str): OPTIONAL - only select entries learned in this VLAN
+            portIndex (str): OPTIONAL - only select entries learned
+                on the port with this IfIndex
+
         Returns:
             XML object for MacTable data
         """
         E = data_element_maker()
+        match = []
+        if vlanID:
+            match.append(E.VLANID(str(vlanID)))
+        if portIndex:
+            match.append(E.PortIndex(str(portIndex)))
         top = E.top(
             E.MAC(
                 E.MacUnicastTable(
-                    E.Unicast()
+                    E.Unicast(*match)
                 )
             )
         )
         return top
 
-    def getMacList(self):
+    def getMacList(self, vlanID=None, port=None):
         """get macList
 
+        The whole unicast table (or the part of it selected by the
+        optional filters) is fetched with one get and decoded row by
+        row, and port indexes are resolved through the device's shared
+        interface map, so the number of RPCs does not depend on the
+        number of MAC entries.
+
+        Args:
+            vlanID (str): OPTIONAL - only return entries of this VLAN.
+                The filter is applied by the device.
+            port (str): OPTIONAL - only return entries learned on this
+                interface, in any form ``normalize_interface_name``
+                accepts, e.g. 'ge1/0/1'. The filter is applied by the device.
+
         Returns:
             macList(list)
+
+        Raises:
+            InterfaceAbsentError: if ``port`` is not an interface
+                of the device.
         """
+        portIndex = None
+        if port:
+            port = normalize_interface_name(port)
+            portIndex = self.device.get_iface_index(port)
+            if not portIndex:
+                raise InterfaceAbsentError(port)
+
+        macTableTop = self.getMacTableTop(vlanID=vlanID, portIndex=portIndex)
+        ifNameMap = self.device.get_iface_name_map()
         macList = []
-        macMap = {}
-        macTableTop = self.getMacTableTop()
-        ruleTop = self.device.get(('subtree', macTableTop))
-        vlanIDList = findall_in_data('VLANID', ruleTop.data_ele)
-        macAddList = findall_in_data('MacAddress', ruleTop.data_ele)
-        portIndexList = findall_in_data('PortIndex', ruleTop.data_ele)
-        statusList = findall_in_data('Status', ruleTop.data_ele)
-        agingList = findall_in_data('Aging', ruleTop.data_ele)
-
-        for vlanID, macAdd, portIndex, status, aging in zip(vlanIDList, macAddList, portIndexList, statusList,
-                                                            agingList):
-            macMap['vlanID'] = vlanID.text
-            macMap['macAdd'] = macAdd.text
-            macMap['portIndex'] = portIndex.text
-            macMap['status'] = status.text
-            macMap['aging'] = aging.text
-            macList.append(macMap.copy())
-            macMap.clear()
-
-        for macTable in macList:
-            ifIndexMap = self.getIfIndexMap(macTable.get('portIndex'))
-            macTable['name'] = ifIndexMap.get('Name')
-            if macTable['status'] == '0':
-                macTable['status'] = 'Other'
-            elif macTable['status'] == '1':
-                macTable['status'] = 'Security'
-            elif macTable['status'] == '2':
-                macTable['status'] = 'Learned'
-            elif macTable['status'] == '3':
-                macTable['status'] = 'Static'
-            elif macTable['status'] == '4':
-                macTable['status'] = 'Blackhole'
-            del macTable['portIndex']
+        for row in self.device.iter_rows(('subtree', macTableTop), 'Unicast'):
+            status = row.get('Status')
+            macList.append({
+                'vlanID': row.get('VLANID'),
+                'macAdd': row.get('MacAddress'),
+                'status': self._status_map.get(status, status),
+                'aging': row.get('Aging'),
+                'name': ifNameMap.get(row.get('PortIndex')),
+            })
 
         return macList
 
@@ -99,13 +126,7 @@ class MacUnicastTable(object):
         Returns:
             ifIndexMap(map)
         """
-        allIfIndexList = []
         ifIndexMap = {}
-        ifIndexTop = self.getIfIndexTop(ifIndex)
-        ruleTop = self.device.get(('subtree', ifIndexTop))
-        ifIndexList = findall_in_data('IfIndex', ruleTop.data_ele)
-        nameList = findall_in_data('Name', ruleTop.data_ele)
-
-        ifIndexMap['IfIndex'] = ifIndexList[0].text
-        ifIndexMap['Name'] = nameList[0].text
+        ifIndexMap['IfIndex'] = ifIndex
+        ifIndexMap['Name'] = self.device.get_iface_name(ifIndex)
         return ifIndexMap
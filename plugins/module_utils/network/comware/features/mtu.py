@@ -9,6 +9,9 @@ from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.f
     InterfaceJumboParamsError)
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.vlan import Vlan
 
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.ifname import (
+    normalize_interface, normalize_interface_full_name
+)
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml.lib import (
     data_element_maker, find_in_data, data_elem_to_dict, nc_element_maker, config_element_maker,
     action_element_maker, reverse_value_map, find_in_action, config_params)
@@ -78,79 +81,18 @@ class Mtu(object):
 
     def _iface_type(self, if_name):
         """Return the normalized interface name and type
-        from a denormalized interface name.
+        from a denormalized interface name. The sub interface
+        number is kept, so a sub interface is never taken for
+        its parent port.
         """
-
-        if if_name.lower().startswith('gi'):
-            if_type = 'GigabitEthernet'
-        elif if_name.lower().startswith('ten'):
-            if_type = 'Ten-GigabitEthernet'
-        elif if_name.lower().startswith('fo'):
-            if_type = 'FortyGigE'
-        elif if_name.lower().startswith('vl'):
-            if_type = 'Vlan-interface'
-        elif if_name.lower().startswith('lo'):
-            if_type = 'LoopBack'
-        elif if_name.lower().startswith('br'):
-            if_type = 'Bridge-Aggregation'
-        elif if_name.lower().startswith('ro'):
-            if_type = 'Route-Aggregation'
-        elif if_name.lower().startswith('tu'):
-            if_type = 'Tunnel'
-        elif if_name.lower().startswith('twentygig'):
-            if_type = 'TwentyGigE'
-        elif if_name.lower().startswith('twenty-fivegig'):
-            if_type = 'Twenty-FiveGigE'
-        elif if_name.lower().startswith('hu'):
-            if_type = 'HundredGigE'
-        else:
-            if_type = None
-
-        number_list = if_name.split(' ')
-        if len(number_list) == 2:
-            number = number_list[-1].strip()
-        else:
-            number = self._get_number(if_name)
-
-        if if_type:
-            proper_interface = if_type + number
-        else:
-            proper_interface = if_name
-
-        return proper_interface, if_type
-
-    @staticmethod
-    def _get_number(if_name):
-        digits = ''
-        for char in if_name:
-            if char.isdigit() or char == '/' or char == ':':
-                digits += char
-        return digits
+        return normalize_interface_full_name(if_name), normalize_interface(if_name)[1]
 
     def _get_iface_index(self):
         """Return the interface index given the self.interface_name
-        attribute by asking the device. If the interface doesn't exist,
-        return the empty string.
+        attribute from the device's shared ifIndex map. If the interface
+        doesn't exist, return the empty string.
         """
-        E = data_element_maker()
-        top = E.top(
-            E.Ifmgr(
-                E.Interfaces(
-                    E.Interface(
-                        E.Name(self.interface_name)
-                    )
-                )
-            )
-        )
-
-        nc_get_reply = self.device.get(('subtree', top))
-        reply_data = find_in_data(
-            self._iface_index_name, nc_get_reply)
-
-        if reply_data is None:
-            return ''
-
-        return reply_data.text
+        return self.device.get_iface_index(self.interface_name)
 
     def _is_ethernet_is_routed(self):
         """Return whether the interface is ethernet and whether
@@ -204,6 +146,7 @@ class Mtu(object):
             (``execute()`` on this class's ``device`` object) of
             commands to create an interface.
          """
+        self.device.invalidate_iface_map()
         if_index = self._get_iface_index()
         if not if_index:
             raise InterfaceCreateError(self.interface_name)
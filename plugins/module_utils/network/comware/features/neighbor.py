@@ -3,6 +3,7 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.ifname import normalize_interface_name
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml.lib import (
     data_element_maker, findall_in_data, find_in_data)
 
@@ -13,47 +14,65 @@ class Neighbors(object):
     Args:
         device (COM7): connected instance of a ``comware.comware.COM7``
             object.
+        interfaces (list): OPTIONAL - only gather neighbors seen on
+            these local interfaces
 
     Attributes:
         device (COM7): connected instance of a ``comware.comware.COM7``
             object.
+        interfaces (list): local interfaces neighbors are gathered on,
+            None for all interfaces
         lldp (lldp): dictionary containing LLDP neighbors
         cdp (cdp): dictionary containing CDP neighbors
 
+    Note:
+        ``lldp`` and ``cdp`` are read from the device the first time
+        they are accessed.
     """
 
-    def __init__(self, device):
+    def __init__(self, device, interfaces=None):
 
         self.device = device
+        self.interfaces = interfaces
 
-        self.lldp = self._get_neighbors(ntype='lldp')
-        self.cdp = self._get_neighbors(ntype='cdp')
+        self._lldp = None
+        self._cdp = None
+
+    @property
+    def lldp(self):
+        if self._lldp is None:
+            self._lldp = self._get_neighbors(ntype='lldp')
+        return self._lldp
+
+    @property
+    def cdp(self):
+        if self._cdp is None:
+            self._cdp = self._get_neighbors(ntype='cdp')
+        return self._cdp
 
     def _get_interface_from_index(self, index):
         """ Returns interface name based on a given ifindex
         """
-        E = data_element_maker()
-        top = E.top(
-            E.Ifmgr(
-                E.Interfaces(
-                    E.Interface(
-                        E.IfIndex(index),
-                        E.Name()
-                    )
-                )
-            )
-        )
-        nc_get_reply = self.device.get(('subtree', top))
-        interface_name = find_in_data('Name', nc_get_reply).text
-
-        return interface_name
+        return self.device.get_iface_name(index)
 
     def refresh(self):
-        """Refreshes the "ldp" and "cdp" attributes of the class
+        """Refreshes the "ldp" and "cdp" attributes of the class,
+        they are read again the next time they are accessed
         """
 
-        self.lldp = self._get_neighbors(ntype='lldp')
-        self.cdp = self._get_neighbors(ntype='cdp')
+        self._lldp = None
+        self._cdp = None
+
+    def _get_interface_indexes(self):
+        """Return the IfIndexes of ``self.interfaces``, leaving out
+        interfaces that don't exist on the device.
+        """
+        indexes = []
+        for interface in self.interfaces:
+            index = self.device.get_iface_index(normalize_interface_name(interface))
+            if index:
+                indexes.append(index)
+        return indexes
 
     def _get_neighbors(self, ntype='lldp'):
         """Gets neighbors of device (COM7)
@@ -69,23 +88,26 @@ class Neighbors(object):
                     :neighbor (str): hostname of the neighbor device for lldp
                         and mgmt IP addr when cdp
         """
-        E = data_element_maker()
         if ntype == 'cdp':
-            top = E.top(
-                E.LLDP(
-                    E.CDPNeighbors(
-                        E.CDPNeighbor()
-                    )
-                )
-            )
+            table, row = 'CDPNeighbors', 'CDPNeighbor'
         else:
-            top = E.top(
-                E.LLDP(
-                    E.LLDPNeighbors(
-                        E.LLDPNeighbor()
-                    )
-                )
+            table, row = 'LLDPNeighbors', 'LLDPNeighbor'
+
+        E = data_element_maker()
+        if self.interfaces is None:
+            rows = [getattr(E, row)()]
+        else:
+            # one row per local interface, each matched on its IfIndex
+            rows = [getattr(E, row)(E.IfIndex(index))
+                    for index in self._get_interface_indexes()]
+            if not rows:
+                return []
+
+        top = E.top(
+            E.LLDP(
+                getattr(E, table)(*rows)
             )
+        )
 
         nc_get_reply = self.device.get(('subtree', top))
         return self._build_response(nc_get_reply, ntype=ntype)
@@ -122,12 +144,14 @@ class Neighbors(object):
             neighbors = findall_in_data('CDPNeighbor', nc_reply)
 
         return_neigh = []
+        if not neighbors:
+            return return_neigh
 
+        name_map = self.device.get_iface_name_map()
         for neigh in neighbors:
             temp = {}
             index = find_in_data('IfIndex', neigh).text
-            interface = self._get_interface_from_index(index)
-            temp['local_intf'] = interface
+            temp['local_intf'] = name_map.get(index)
             for new_key, xml_tag in key_map.items():
                 obj = find_in_data(xml_tag, neigh)
                 if obj is not None:
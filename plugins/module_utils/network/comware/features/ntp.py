@@ -4,7 +4,7 @@ author: liudongxue
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.interface import Interface
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.interface import LazyInterface
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml.lib import (
     nc_element_maker, config_element_maker,
     operation_kwarg, reverse_value_map, config_params)
@@ -79,10 +79,10 @@ class Ntp(object):
         self._r_value_map_auth = reverse_value_map(self._r_key_map_auth, self._value_map_auth)
         self._r_key_map_delauth = dict(reversed(item) for item in self._key_map_delauth.items())
         self._r_value_map_delauth = reverse_value_map(self._r_key_map_delauth, self._value_map_delauth)
-        interface = Interface(device, interface_name)
+        interface = LazyInterface(device, interface_name)
         self.device = device
         self.interface_name, self.iface_type, subiface_num = interface._iface_type(interface_name)
-        self.iface_index = interface._get_iface_index()
+        self.iface_index = interface.iface_index
         self.iface_exists = True if self.iface_index != '1' else False
 
     def enable_ntp(self, stage=False, ntpenable='false', ntpauthenable='false'):
@@ -58,11 +58,10 @@ class Ospf(object):
     #     return defaults
     def get_config(self):
         ospf = {}
-        # commands = 'dis this | inc ospf'
-        commands = 'dis current-configuration interface {0} | inc ospf'.format(self.name)
-        res = self.device.cli_display(commands)
-        res_by_line = res.split('\n')
-        for each in res_by_line[1:]:
+        section = self.device.get_running_config().interface(self.name)
+        if section is None:
+            return ospf
+        for each in section.include('ospf'):
             ele = each.split(' ')
             if len(ele) > 2:
                 ele_key = ele[2]
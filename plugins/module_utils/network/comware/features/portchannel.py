@@ -3,12 +3,14 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-import base64
-
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.errors import (
     InvalidPortType, AggregationGroupError
 )
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.interface import Interface
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.bitmap import (
+    bitmap_to_indexes, indexes_to_bitmap
+)
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.ifname import normalize_interface_name
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml.lib import (
     data_element_maker, findall_in_data, find_in_data, data_elem_to_dict, nc_element_maker, config_element_maker,
     operation_kwarg, reverse_value_map, config_params, find_in_config)
@@ -190,11 +192,12 @@ class Portchannel(object):
                 # building dictionary that has keys that are Interface names
                 # and has values that are the associated IfIndex values
                 for count, each in enumerate(members_by_name):
-                    self._members_map_interface_key[each.lower()] = \
+                    self._members_map_interface_key[normalize_interface_name(each)] = \
                         members_by_index[count]
 
-                for memb in members_by_name:
-                    mode = self.get_lacp_mode_by_name(name=memb)
+                lacp_modes = self.get_lacp_modes()
+                for count, memb in enumerate(members_by_name):
+                    mode = lacp_modes.get(str(members_by_index[count]))
                     temp = dict(interface=memb, lacp_mode=mode)
                     members.append(temp)
 
@@ -297,6 +300,35 @@ class Portchannel(object):
 
         return return_lacp.get('lacp_mode')
 
+    def get_lacp_modes(self):
+        """Get current LACP mode of every member of the portchannel
+        with one read of its rows in the LAGG member table.
+
+           Returns:
+               A dictionary that has IfIndex values as keys and
+               "active" or "passive" as values
+        """
+        E = data_element_maker()
+        top = E.top(
+            E.LAGG(
+                E.LAGGMembers(
+                    E.LAGGMember(
+                        E.GroupId(self._xgroupid),
+                        E.IfIndex(),
+                        E.LacpMode()
+                    )
+                )
+            )
+        )
+
+        lacp_modes = {}
+        for row in self.device.iter_rows(('subtree', top), 'LAGGMember',
+                                         key_map=self.LACP, value_map=self.lacp_value_map):
+            if row.get('intf_index') is not None:
+                lacp_modes[row['intf_index']] = row.get('lacp_mode')
+
+        return lacp_modes
+
     def _get_members_from_bitmap(self, bitmap):
         """Return list of interface names from bitmap encoded as base64
 
@@ -304,76 +336,33 @@ class Portchannel(object):
                 bitmap (str): memberlist as base64 as retrieved via NETCONF
 
             Returns:
-                This returns a list of interface names.
+                This returns a list of IfIndexes (int) and a list of
+                interface names. Names are resolved with the device's
+                ifIndex map, i.e. one read of the interface table.
 
         """
-        hex_value = base64.b64decode(bitmap).hex()
-        h_size = len(hex_value) * 4
-        binary_value = (bin(int(hex_value, 16))[2:]).zfill(h_size)
-
-        members_by_index = []
-        for index, bit in enumerate(binary_value):
-            port = index + 1
-            if bit == '1':
-                members_by_index.append(port)
-        members_by_name = []
-        for index in members_by_index:
-            members_by_name.append(self.get_interface_from_index(str(index)))
+        members_by_index = bitmap_to_indexes(bitmap)
+        name_map = self.device.get_iface_name_map()
+        members_by_name = [name_map.get(str(index)) for index in members_by_index]
 
         return members_by_index, members_by_name
 
-    #    def _get_bitmap_from_members(self, members):
-    #        """Return bitmap given a list of interface names
-    #           Not used, but kept, just in case :)
-    #        """
-    #        index_list = []
-    #        for member in members:
-    #            index = self.get_index_from_interface(member)
-    #            index_list.append(int(index))
-    #
-    #        index_list.sort()
-    #        binary = ''
-    #        start = 1
-    #        for finish in index_list:
-    #            for num in range(start, finish):
-    #                binary += '0'
-    #            binary += '1'
-    #            start = finish + 1
-    #
-    #        lenbinary = len(binary)
-    #        start = 8
-    #        while (start % lenbinary) == start:
-    #            start += 8
-    #        newfill = start - len(binary)
-    #        binary += newfill * '0'
-    #
-    #        # chr only goes up to 255!!! fixed in py3!!! ugh
-    #        # bitmap = base64.b64encode(chr(int(binary, 2)))
-    #        hexa = hex(int(binary, 2))[2:]
-    #        if len(hexa) % 2 != 0:
-    #            hexa += '0'
-    #        converted_to_ascii = binascii.a2b_hex(hexa)
-    #        bitmap = base64.b64encode(converted_to_ascii)
-    #
-    #        return bitmap
+    def _get_bitmap_from_members(self, members):
+        """Return bitmap encoded as base64 given a list of interface names
+
+            Args:
+                members (list): interface names
+
+            Returns:
+                This returns the memberlist as base64, as used via NETCONF.
+        """
+        index_list = [self.get_index_from_interface(member) for member in members]
+        return indexes_to_bitmap(index_list)
+
     def get_interface_from_index(self, index):
         """Return interface name based on a given ifindex
         """
-        E = data_element_maker()
-        top = E.top(
-            E.Ifmgr(
-                E.Interfaces(
-                    E.Interface(
-                        E.IfIndex(index)
-                    )
-                )
-            )
-        )
-
-        nc_get_reply = self.device.get(('subtree', top))
-        interface_name = find_in_data('Name', nc_get_reply).text
-
-        return interface_name
+        return self.device.get_iface_name(index)
 
     def _pc_group_mapping(self):
         """Map user input for portchannel group to the internal integer
@@ -397,13 +386,10 @@ class Portchannel(object):
         elif self.pc_type == 'routed':
             self.fulltype = 'Route-Aggregation'
 
-        text = self.device.cli_display(
-            'display current-configuration interface {0} {1}'.format(
-                self.fulltype, self.groupid))
-
-        text_as_list = text.split('\n')
+        section = self.device.get_running_config().interface(
+            '{0}{1}'.format(self.fulltype, self.groupid))
 
-        self.raw_config = text_as_list
+        self.raw_config = section.lines() if section is not None else []
 
     def get_selected_port_min(self):
         """Get selected port min configuration
@@ -518,16 +504,18 @@ class Portchannel(object):
                 interface (str): name of the interface
 
             Returns:
-                This returns the IfIndex for an interface.
+                This returns the IfIndex for an interface, or the
+                empty string if the interface doesn't exist.
 
         """
 
+        interface = normalize_interface_name(interface)
         local_index = self._members_map_interface_key.get(interface)
         if local_index:
             index = local_index
         else:
-            intf = Interface(self.device, interface)
-            index = str(intf.iface_index)
+            # the device's shared ifIndex map, fetched once per session
+            index = self.device.get_iface_index(interface)
             self._members_map_interface_key[interface] = index
 
         return index
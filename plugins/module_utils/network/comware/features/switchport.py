@@ -4,9 +4,10 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.interface import Interface
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.vlanset import VlanSet
 
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml.lib import (
-    data_element_maker, find_in_data, data_elem_to_dict, nc_element_maker, config_element_maker,
+    data_element_maker, find_in_data, data_elem_to_dict, data_elems_to_dicts, nc_element_maker, config_element_maker,
     operation_kwarg, config_params)
 
 
@@ -405,3 +406,203 @@ class Switchport(object):
                 return self.device.edit_config(config)
 
         return False
+
+
+class Switchports(object):
+    """This class is used to get and build the layer 2 configuration
+    of many switchports at once on ``COM7`` devices.
+
+    The access, trunk and hybrid tables are read with a single get,
+    and the changes of all switchports are sent in one edit-config
+    that only carries what differs from the device. VLAN lists are
+    compared as ``VlanSet`` bitsets.
+
+    Args:
+        device (COM7): connected instance of a ``comware.comware.COM7``
+            object.
+
+    Attributes:
+        device (COM7): connected instance of a ``comware.comware.COM7``
+            object.
+    """
+
+    # XML table, row fields and settings omitted by a replacing
+    # configuration, by link type
+    _link_tables = {
+        'access': ('AccessInterfaces', {'pvid': 'PVID'},
+                   {'pvid': '1'}),
+        'trunk': ('TrunkInterfaces', {'pvid': 'PVID',
+                                      'permitted_vlans': 'PermitVlanList'},
+                  {'pvid': '1', 'permitted_vlans': '1'}),
+        'hybrid': ('HybridInterfaces', {'pvid': 'PVID',
+                                        'untaggedvlan': 'UntaggedVlanList',
+                                        'taggedvlan': 'TaggedVlanList'},
+                   {'pvid': '1', 'untaggedvlan': '1', 'taggedvlan': ''}),
+    }
+
+    _link_type_values = {'access': '1', 'trunk': '2', 'hybrid': '3'}
+
+    _vlan_list_keys = ('permitted_vlans', 'untaggedvlan', 'taggedvlan')
+
+    def __init__(self, device):
+        self.device = device
+        self._configs = None
+
+    def _gen_top(self):
+        E = data_element_maker()
+        tables = []
+        for table, key_map, dummy in self._link_tables.values():
+            tables.append(getattr(E, table)(
+                E.Interface(
+                    E.IfIndex(),
+                    *[getattr(E, tag)() for tag in key_map.values()]
+                )
+            ))
+
+        return E.top(E.VLAN(*tables))
+
+    def get_configs(self):
+        """Return the layer 2 configuration of every switchport.
+
+        The tables are read once and kept until ``refresh()``.
+
+        Returns:
+            A dictionary keyed by interface name. Values are
+            dictionaries like ``Switchport.get_config()`` returns.
+        """
+        if self._configs is None:
+            nc_get_reply = self.device.get(('subtree', self._gen_top()))
+            names = self.device.get_iface_name_map()
+
+            self._configs = {}
+            for link_type, (table, key_map, dummy) in self._link_tables.items():
+                table_xml = find_in_data(table, nc_get_reply)
+                if table_xml is None:
+                    continue
+                for config in data_elems_to_dicts(table_xml, dict(key_map, index='IfIndex')):
+                    name = names.get(config.pop('index', None))
+                    if name:
+                        config['link_type'] = link_type
+                        self._configs[name] = config
+        return self._configs
+
+    def refresh(self):
+        """Forget the configurations read so far.
+        """
+        self._configs = None
+
+    def _desired(self, params):
+        """Return the complete configuration that replaces the current one,
+        settings that are not given being set to their defaults.
+        """
+        link_type = params.get('link_type', 'access')
+        dummy, key_map, defaults = self._link_tables[link_type]
+        desired = dict(defaults)
+        desired.update((k, v) for k, v in params.items()
+                       if v is not None and k in key_map)
+        desired['link_type'] = link_type
+        return desired
+
+    def _same(self, key, existing, desired):
+        if key in self._vlan_list_keys:
+            return VlanSet(existing) == VlanSet(desired)
+        return existing == desired
+
+    def get_deltas(self, proposed, state='replaced'):
+        """Return the minimal changes that give each switchport
+        the proposed configuration.
+
+        Args:
+            proposed (dict): layer 2 settings keyed by interface name,
+                see ``Switchport.build()`` for the settings.
+            state (str): 'replaced' replaces the configuration of the
+                proposed switchports only, settings that are not given
+                being defaulted. 'overridden' also defaults every other
+                switchport.
+
+        Returns:
+            A dictionary keyed by interface name of the settings to
+            change. 'link_type' is only given when the link type changes,
+            in which case every setting of the new link type is given.
+            Switchports without changes are left out.
+        """
+        configs = self.get_configs()
+
+        desired_configs = dict((name, self._desired(params))
+                               for name, params in proposed.items())
+        if state == 'overridden':
+            for name in configs:
+                if name not in desired_configs:
+                    desired_configs[name] = self._desired({})
+
+        deltas = {}
+        for name, desired in desired_configs.items():
+            existing = configs.get(name, {})
+            if existing.get('link_type') != desired['link_type']:
+                deltas[name] = desired
+                continue
+            delta = dict((k, v) for k, v in desired.items()
+                         if not self._same(k, existing.get(k), v))
+            if delta:
+                deltas[name] = delta
+        return deltas
+
+    def build(self, deltas, stage=False):
+        """Stage or execute the changes of many switchports
+        as a single edit-config. Link types are converted first,
+        then the access, trunk and hybrid settings are merged.
+
+        Args:
+            deltas (dict): changes keyed by interface name,
+                as returned by ``get_deltas()``.
+            stage (bool): whether to stage the command or execute immediately
+
+        Returns:
+            True if stage=True and successfully staged
+            etree.Element XML response if immediate execution
+            False if there is nothing to change
+        """
+        if not deltas:
+            return False
+
+        configs = self.get_configs()
+        indexes = self.device.get_iface_index_map()
+        EN = nc_element_maker()
+        EC = config_element_maker()
+
+        conversions = []
+        rows = dict((link_type, []) for link_type in self._link_tables)
+        for name in sorted(deltas):
+            delta = dict(deltas[name])
+            index = indexes.get(name)
+            link_type = delta.pop('link_type', None)
+            if link_type is not None:
+                conversions.append(EC.Interface(
+                    EC.IfIndex(index),
+                    EC.LinkType(self._link_type_values[link_type])
+                ))
+            else:
+                link_type = configs[name]['link_type']
+
+            if delta:
+                key_map = self._link_tables[link_type][1]
+                rows[link_type].append(EC.Interface(
+                    EC.IfIndex(index),
+                    *config_params(delta, key_map)
+                ))
+
+        top = EC.top()
+        if conversions:
+            top.append(EC.Ifmgr(EC.Interfaces(*conversions)))
+        tables = [getattr(EC, self._link_tables[link_type][0])(*rows[link_type])
+                  for link_type in ('access', 'trunk', 'hybrid') if rows[link_type]]
+        if tables:
+            top.append(EC.VLAN(*tables))
+
+        config = EN.config(top)
+
+        self.refresh()
+        if stage:
+            return self.device.stage_config(config, 'edit_config')
+        else:
+            return self.device.edit_config(config)
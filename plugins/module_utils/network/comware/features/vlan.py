@@ -51,6 +51,23 @@ class Vlan(object):
 
         return top
 
+    @staticmethod
+    def gen_table_top():
+        E = data_element_maker()
+        top = E.top(
+            E.VLAN(
+                E.VLANs(
+                    E.VLANID(
+                        E.ID(),
+                        E.Name(),
+                        E.Description()
+                    )
+                )
+            )
+        )
+
+        return top
+
     def get_vlan_list(self):
         """Get a list of VLAN IDs that exist on the switch.
 
@@ -59,7 +76,7 @@ class Vlan(object):
         """
         top = self.gen_top()
         nc_get_reply = self.device.get(('subtree', top))
-        vlans_xml = findall_in_data('ID', nc_get_reply.data_ele)
+        vlans_xml = findall_in_data('ID', nc_get_reply)
         vlans = [vlan.text for vlan in vlans_xml]
 
         return vlans
@@ -89,6 +106,43 @@ class Vlan(object):
 
         return vlan_config
 
+    def get_vlan_configs(self):
+        """Gets current configuration of every VLAN on the switch
+        with a single read of the whole VLAN table.
+
+        Returns:
+            A dictionary keyed by VLAN ID (str). Each value is
+            a dictionary shaped like the one ``get_config`` returns.
+        """
+        top = self.gen_table_top()
+        vlan_configs = {}
+        for row in self.device.iter_rows(('subtree', top), 'VLANID', key_map=self.vlan_key_map):
+            vlanid = row.get('vlanid')
+            if vlanid is not None:
+                vlan_configs[vlanid] = row
+
+        return vlan_configs
+
+    def build_vlans(self, vlans, state='present', stage=False):
+        """Stage or execute a single XML object that configures,
+        or removes, many VLANs at once.
+
+        Args:
+            vlans (list): dictionaries with a 'vlanid' key and
+                optional 'name' and 'descr' keys, one per VLAN
+            state (str): must be "present" or "absent"
+            stage (bool): whether to stage the command or execute immediately
+
+        Returns:
+            True if stage=True and successfully staged
+            etree.Element XML response if immediate execution
+        """
+        config = self._build_vlans_config(state, vlans)
+        if stage:
+            return self.device.stage_config(config, 'edit_config')
+        else:
+            return self.device.edit_config(config)
+
     def remove(self, stage=False):
         """Stage or execute XML object for VLAN removal and send to staging
 
@@ -138,6 +192,20 @@ class Vlan(object):
                 name (str): OPTIONAL - VLAN name
                 descr (str): OPTOINAL - VLAN description
 
+        Returns:
+            XML object for VLAN configuration
+        """
+        vlan['vlanid'] = self.vlanid
+        return self._build_vlans_config(state, [vlan])
+
+    def _build_vlans_config(self, state, vlans):
+        """Build one XML object for the configuration of many VLANs
+
+        Args:
+            state (str): must be "present" or "absent"
+            vlans (list): dictionaries with a 'vlanid' key and
+                optional 'name' and 'descr' keys
+
         Returns:
             XML object for VLAN configuration
         """
@@ -150,14 +218,12 @@ class Vlan(object):
         EC = nc_element_maker()
         E = config_element_maker()
 
-        vlan['vlanid'] = self.vlanid
         config = EC.config(
             E.top(
                 E.VLAN(
                     E.VLANs(
-                        E.VLANID(
-                            *config_params(vlan, self.vlan_key_map)
-                        )
+                        *[E.VLANID(*config_params(vlan, self.vlan_key_map))
+                          for vlan in vlans]
                     ),
                     **operation_kwarg(operation)
                 )
@@ -83,12 +83,7 @@ class VRRP(object):
 
         """
         auth = {}
-        commands = 'display current-configuration interface' \
-                   + ' {0} | inc "vrid {1} auth"'.format(self.interface,
-                                                         self.vrid)
-        rsp = self.device.cli_display(commands)
-        by_line = rsp.split('\n')
-        for each in by_line[1:]:
+        for each in self._get_interface_config('vrid {0} auth'.format(self.vrid)):
             if 'authentication-mode' in each:
                 auth = each.split('authentication-mode')[-1].strip()
                 auth_vars = auth.split(' ')
@@ -114,12 +109,7 @@ class VRRP(object):
 
         """
         track = {}
-        commands = 'display current-configuration interface' \
-                   + ' {0} | inc "vrid {1} track"'.format(self.interface,
-                                                          self.vrid)
-        rsp = self.device.cli_display(commands)
-        by_line = rsp.split('\n')
-        for each in by_line[1:]:
+        for each in self._get_interface_config('vrid {0} track'.format(self.vrid)):
             if 'track' in each:
                 track = each.split('track')[-1].strip()
                 track_vars = track.split(' ')
@@ -129,6 +119,15 @@ class VRRP(object):
                     track = dict(track=track, switch=switch, )
         return track
 
+    def _get_interface_config(self, pattern):
+        """Return the lines of the interface's running configuration
+        that contain ``pattern``
+        """
+        section = self.device.get_running_config().interface(self.interface)
+        if section is None:
+            return []
+        return section.include(pattern)
+
     @staticmethod
     def _apply_value_maps(existing):
         """Manipulating value for preempt
@@ -0,0 +1,158 @@
+"""Record the RPCs of a connection to a file and replay them later
+without a device, e.g. to measure the RPC count and CPU time of the
+modules in CI.
+
+A recording holds one JSON object per line, with the RPC name, its
+arguments, the JSON-RPC response of the connection plugin and the wall
+time of the call. Files whose name ends with '.gz' are gzip compressed.
+
+``get_connection`` records when the ``COMWARE_RECORD`` environment
+variable names a file, and replays when ``COMWARE_REPLAY`` does.
+``COMWARE_REPLAY_LATENCY`` adds a delay to each replayed RPC: a number
+of seconds, or 'recorded' to wait as long as the recorded call took.
+"""
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import gzip
+import io
+import json
+import os
+import time
+
+from ansible.module_utils.connection import ConnectionError
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.netconf import (
+    NetconfConnection,
+)
+
+RECORD_ENV_VAR = 'COMWARE_RECORD'
+REPLAY_ENV_VAR = 'COMWARE_REPLAY'
+REPLAY_LATENCY_ENV_VAR = 'COMWARE_REPLAY_LATENCY'
+
+
+def _open(path, mode):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return io.open(path, mode, encoding='utf-8')
+
+
+def _request_key(name, args, kwargs):
+    return json.dumps([name, args, kwargs], sort_keys=True)
+
+
+def record_connection(connection, path):
+    """Make a connection append each of its RPCs to a recording.
+
+    The connection's ``_exec_jsonrpc`` is wrapped in place, so every
+    RPC method of the connection plugin, and its handling of replies
+    and errors, work as before.
+
+    Args:
+        connection (Connection): connection to the persistent
+            connection socket, e.g. a ``NetconfConnection``
+        path (str): file the RPCs are appended to
+
+    Returns:
+        The same connection.
+    """
+    exec_jsonrpc = connection._exec_jsonrpc
+
+    def recording_exec_jsonrpc(name, *args, **kwargs):
+        start = time.time()
+        response = exec_jsonrpc(name, *args, **kwargs)
+        wall_time = time.time() - start
+
+        record = {
+            'rpc': name,
+            'args': list(args),
+            'kwargs': kwargs,
+            'response': response,
+            'wall_time': round(wall_time, 6),
+        }
+        with _open(path, 'a') as recording:
+            recording.write(json.dumps(record) + '\n')
+        return response
+
+    connection._exec_jsonrpc = recording_exec_jsonrpc
+    return connection
+
+
+def read_recording(path):
+    """Return the records of a recording, in the order they were made.
+    """
+    records = []
+    with _open(path, 'r') as recording:
+        for line in recording:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+class ReplayConnection(NetconfConnection):
+    """A ``NetconfConnection`` that answers each RPC with the response
+    recorded for the same request, without a device.
+
+    Requests are matched on the RPC name and arguments. A request that
+    was recorded several times gets the recorded responses in turn, the
+    last one being repeated once they are used up, so a replay is
+    deterministic whatever order independent requests are made in.
+
+    Args:
+        path (str): recording made by ``record_connection``
+        latency (float or str): OPTIONAL - seconds to wait before each
+            reply, or 'recorded' to wait as long as the recorded call.
+
+    Attributes:
+        calls (list): (rpc name, wall time) of every replayed RPC.
+    """
+
+    def __init__(self, path, latency=0.0):
+        super(ReplayConnection, self).__init__(path)
+        self.latency = latency
+        self.calls = []
+        self._replies = {}
+        for record in read_recording(path):
+            key = _request_key(record['rpc'], record['args'], record.get('kwargs', {}))
+            self._replies.setdefault(key, []).append(record)
+
+    def _exec_jsonrpc(self, name, *args, **kwargs):
+        start = time.time()
+        key = _request_key(name, list(args), kwargs)
+        records = self._replies.get(key)
+        if not records:
+            raise ConnectionError('No recorded reply for %s %s' % (name, json.dumps(list(args))))
+
+        record = records.pop(0) if len(records) > 1 else records[0]
+        if self.latency == 'recorded':
+            time.sleep(record.get('wall_time', 0))
+        elif self.latency:
+            time.sleep(float(self.latency))
+
+        self.calls.append((name, time.time() - start))
+        return record['response']
+
+    def get_capabilities(self):
+        """Return the recorded capabilities, as text, like the
+        persistent connection does.
+        """
+        return self._exec_jsonrpc('get_capabilities')['result']
+
+
+def recording_path():
+    """Return the file named by ``COMWARE_RECORD``, or None.
+    """
+    return os.environ.get(RECORD_ENV_VAR) or None
+
+
+def get_replay_connection():
+    """Return a ``ReplayConnection`` for the file named by
+    ``COMWARE_REPLAY``, or None if it is not set.
+    """
+    path = os.environ.get(REPLAY_ENV_VAR)
+    if not path:
+        return None
+    latency = os.environ.get(REPLAY_LATENCY_ENV_VAR, '0')
+    if latency != 'recorded':
+        latency = float(latency)
+    return ReplayConnection(path, latency=latency)
@@ -0,0 +1,56 @@
+"""Convert between the base64 port bitmaps used by Comware NETCONF
+tables (e.g. LAGG/LAGGGroups/LAGGGroup/MemberList) and lists of indexes.
+
+Bit 0 of the bitmap is the most significant bit of the first byte
+and stands for index 1.
+"""
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import base64
+
+try:
+    import numpy
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+def bitmap_to_indexes(bitmap):
+    """Return the sorted list of indexes (int) set in a base64 bitmap.
+
+    Uses numpy.unpackbits when NumPy is installed, otherwise walks the
+    set bits of each non-zero byte with int.bit_length().
+    """
+    raw = base64.b64decode(bitmap)
+    if HAS_NUMPY:
+        bits = numpy.unpackbits(numpy.frombuffer(raw, dtype=numpy.uint8))
+        return (numpy.flatnonzero(bits) + 1).tolist()
+
+    indexes = []
+    for byte_num, byte in enumerate(bytearray(raw)):
+        base = byte_num * 8
+        while byte:
+            high = byte.bit_length() - 1
+            indexes.append(base + 8 - high)
+            byte ^= 1 << high
+    return indexes
+
+
+def indexes_to_bitmap(indexes, length=None):
+    """Return the base64 bitmap (str) with the given indexes set.
+
+    Args:
+        indexes (list): indexes (int or str), starting at 1
+        length (int): OPTIONAL - size of the bitmap in bytes. Defaults
+            to the fewest bytes that hold the highest index.
+    """
+    indexes = [int(index) for index in indexes]
+    if length is None:
+        length = (max(indexes) + 7) // 8 if indexes else 0
+
+    raw = bytearray(length)
+    for index in indexes:
+        pos = index - 1
+        raw[pos // 8] |= 0x80 >> (pos % 8)
+    return base64.b64encode(bytes(raw)).decode('ascii')
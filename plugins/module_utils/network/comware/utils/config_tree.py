@@ -0,0 +1,285 @@
+"""Parse Comware text configuration, as printed by
+``display current-configuration``, into a tree of indented sections.
+"""
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import re
+
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.ifname import (
+    normalize_interface_full_name
+)
+
+# command echo or prompt, e.g. "<HOST>display current-configuration"
+_PROMPT_RE = re.compile(r'^\s*<[^>]*>')
+
+
+class ConfigSection(object):
+    """One line of configuration and the lines indented below it.
+
+    Attributes:
+        text (str): the line as printed, with its indentation
+        line (str): the line without indentation
+        indent (int): number of leading spaces
+        parent (ConfigSection): enclosing section, None for the root
+        children (list): ConfigSection objects for the lines below
+    """
+
+    __slots__ = ('text', 'line', 'indent', 'parent', 'children')
+
+    def __init__(self, text, parent=None):
+        self.text = text
+        self.line = text.strip()
+        self.indent = len(text) - len(text.lstrip(' '))
+        self.parent = parent
+        self.children = []
+
+    def lines(self):
+        """Return the lines of the section, its own line first,
+        in the order they were printed.
+        """
+        lines = [self.text] if self.text else []
+        stack = list(reversed(self.children))
+        while stack:
+            section = stack.pop()
+            lines.append(section.text)
+            stack.extend(reversed(section.children))
+        return lines
+
+    def child(self, line):
+        """Return the child section whose line is ``line``,
+        ignoring repeated spaces, or None.
+        """
+        line = ' '.join(line.split())
+        for section in self.children:
+            if ' '.join(section.line.split()) == line:
+                return section
+        return None
+
+    def include(self, pattern):
+        """Return the lines of the section that contain ``pattern``,
+        like ``| include`` with a plain string.
+        """
+        return [text for text in self.lines() if pattern in text]
+
+
+class ConfigTree(ConfigSection):
+    """The root of a parsed configuration.
+
+    Top-level sections are indexed by their first word
+    (``sections('bgp')``) and interface sections by their normalized
+    interface name, sub interface number included
+    (``interface('gi1/0/1')``, ``interface('gi1/0/1.5')``).
+
+    Args:
+        text (str): configuration text. Command echoes, prompts, '#'
+            separators and the closing 'return' are ignored.
+    """
+
+    __slots__ = ('_keyword_index', '_interface_index')
+
+    def __init__(self, text):
+        super(ConfigTree, self).__init__('')
+        self._keyword_index = {}
+        self._interface_index = {}
+        self._parse(text or '')
+
+    def _parse(self, text):
+        stack = [self]
+        for raw in text.splitlines():
+            raw = raw.rstrip()
+            stripped = raw.strip()
+            if not stripped or stripped.startswith('#') or _PROMPT_RE.match(raw):
+                continue
+            if stripped == 'return' and raw == stripped:
+                break
+
+            indent = len(raw) - len(raw.lstrip(' '))
+            while len(stack) > 1 and stack[-1].indent >= indent:
+                stack.pop()
+            parent = stack[-1]
+            section = ConfigSection(raw, parent)
+            parent.children.append(section)
+            stack.append(section)
+
+            if parent is self:
+                self._index(section)
+
+    def _index(self, section):
+        words = section.line.split()
+        self._keyword_index.setdefault(words[0], []).append(section)
+        if words[0] == 'interface' and len(words) > 1:
+            self._interface_index[normalize_interface_full_name(words[1])] = section
+
+    def sections(self, keyword):
+        """Return the top-level sections whose first word is ``keyword``,
+        e.g. 'bgp', 'ospf' or 'vlan'.
+        """
+        return self._keyword_index.get(keyword, [])
+
+    def interface(self, name):
+        """Return the section of an interface, or None.
+
+        Args:
+            name (str): interface name in any form accepted by
+                ``normalize_interface_name``, e.g. 'Tunnel1', 'gi1/0/1'
+                or 'gi1/0/1.5' for a sub interface
+        """
+        return self._interface_index.get(normalize_interface_full_name(name))
+
+
+def _key(section):
+    return ' '.join(section.line.split())
+
+
+# commands that hold a single value, which is left out of their
+# 'undo' and replaced by setting the command again,
+# e.g. 'description foo' -> 'undo description'
+_VALUE_COMMANDS = (
+    ('description',),
+    ('sysname',),
+    ('mtu',),
+    ('speed',),
+    ('duplex',),
+    ('port', 'link-type'),
+    ('port', 'link-mode'),
+    ('port', 'access', 'vlan'),
+    ('port', 'trunk', 'pvid', 'vlan'),
+    ('port', 'hybrid', 'pvid', 'vlan'),
+    ('link-aggregation', 'mode'),
+)
+
+
+def _command(section):
+    """Return the words of the single value command of a section,
+    without its value, or None.
+    """
+    words = section.line.split()
+    for command in _VALUE_COMMANDS:
+        if len(words) > len(command) and tuple(words[:len(command)]) == command:
+            return command
+    return None
+
+
+def _is_physical_interface(section):
+    # e.g. 'interface GigabitEthernet1/0/1', which can't be undone,
+    # unlike 'interface Vlan-interface10' or 'interface GigabitEthernet1/0/1.5'
+    words = section.line.split()
+    return (len(words) == 2 and words[0] == 'interface'
+            and '/' in words[1] and '.' not in words[1])
+
+
+def _remove_commands(section, commands):
+    line = section.line
+    command = _command(section)
+    if line.startswith('undo '):
+        commands.append(line[len('undo '):])
+    elif command:
+        commands.append('undo ' + ' '.join(command))
+    elif _is_physical_interface(section) and section.children:
+        commands.append(line)
+        for child in section.children:
+            _remove_commands(child, commands)
+        commands.append('quit')
+    elif not _is_physical_interface(section):
+        commands.append('undo ' + line)
+
+
+def _diff_sections(old, new):
+    """Yield the changes that turn section ``old`` into section ``new``
+    as (kind, section) tuples, kind being 'remove', 'replace', 'add',
+    'enter' or 'exit'. Each list of children is walked once, matching
+    lines through a dictionary, so the cost is linear in the size of
+    both configurations.
+
+    Lines only found in ``old`` are removed first, in their order, or
+    marked as replaced when ``new`` sets the same single value command
+    (e.g. another 'description'). Then the lines of ``new`` are walked
+    in order: new lines are added and sections found in both are
+    entered if anything below them changed.
+    """
+    new_keys = set(_key(section) for section in new.children)
+    new_commands = set(_command(section) for section in new.children)
+    old_index = dict((_key(section), section) for section in old.children)
+
+    for section in old.children:
+        if _key(section) not in new_keys:
+            command = _command(section)
+            if command and command in new_commands:
+                yield 'replace', section
+            else:
+                yield 'remove', section
+
+    for section in new.children:
+        old_section = old_index.get(_key(section))
+        if old_section is None:
+            yield 'add', section
+        elif section.children or old_section.children:
+            changes = list(_diff_sections(old_section, section))
+            if changes:
+                yield 'enter', section
+                for change in changes:
+                    yield change
+                yield 'exit', section
+
+
+def _add_commands(section, commands):
+    commands.append(section.line)
+    if section.children:
+        for child in section.children:
+            _add_commands(child, commands)
+        commands.append('quit')
+
+
+def diff_config(old, new):
+    """Return the ordered list of CLI commands that turns
+    configuration ``old`` into configuration ``new``.
+
+    Removed lines become 'undo' commands (or lose their 'undo') and
+    every section entered is left again with 'quit', so the
+    list can be sent as is with ``cli_config``. A single value command,
+    like 'description foo', is undone without its value, or only set
+    again when ``new`` has another value for it. A removed physical
+    interface can't be undone, so the commands below it are undone
+    instead.
+
+    Other removed lines are undone as printed, e.g. 'undo vlan 10' or
+    'undo port trunk permit vlan 10', which is what Comware expects for
+    most commands, but not for all: commands that hold a single value
+    and are missing from ``_VALUE_COMMANDS`` may be rejected by the
+    device.
+
+    Args:
+        old (ConfigTree): configuration in place, e.g. the running config
+        new (ConfigTree): desired configuration
+    """
+    commands = []
+    for kind, section in _diff_sections(old, new):
+        if kind == 'remove':
+            _remove_commands(section, commands)
+        elif kind == 'add':
+            _add_commands(section, commands)
+        elif kind == 'enter':
+            commands.append(section.line)
+        elif kind == 'exit':
+            commands.append('quit')
+    return commands
+
+
+def diff_summary(old, new):
+    """Return a readable summary of the differences between
+    configuration ``old`` and configuration ``new``.
+
+    Lines of ``new`` missing from ``old`` start with '+', lines of
+    ``old`` missing from ``new`` start with '-'. Both keep their
+    indentation and follow the header of the section they are in.
+    """
+    summary = []
+    for kind, section in _diff_sections(old, new):
+        if kind in ('remove', 'replace'):
+            summary.append('-' + section.text)
+        elif kind == 'add':
+            summary.extend('+' + text for text in section.lines())
+        elif kind == 'enter':
+            summary.append(' ' + section.text)
+    return summary
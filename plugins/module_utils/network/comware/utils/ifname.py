@@ -0,0 +1,112 @@
+"""Normalize interface names given in any of the short or long forms
+accepted on the command line, e.g. 'gi1/0/1', 'GigabitEthernet 1/0/1'
+or 'ten1/0/1.10', to the names used by the device.
+"""
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import re
+
+# (lower-case prefix, interface type), in the order the prefixes are tried
+IFACE_TYPES = (
+    ('gi', 'GigabitEthernet'),
+    ('ten', 'Ten-GigabitEthernet'),
+    ('fo', 'FortyGigE'),
+    ('vl', 'Vlan-interface'),
+    ('vs', 'Vsi-interface'),
+    ('lo', 'LoopBack'),
+    ('br', 'Bridge-Aggregation'),
+    ('ro', 'Route-Aggregation'),
+    ('tu', 'Tunnel'),
+    ('twentygig', 'TwentyGigE'),
+    ('twenty-fivegig', 'Twenty-FiveGigE'),
+    ('hu', 'HundredGigE'),
+    # abbreviations printed by the device, e.g. in 'display interface brief'
+    ('ge', 'GigabitEthernet'),
+    ('xge', 'Ten-GigabitEthernet'),
+    ('fge', 'FortyGigE'),
+    ('wge', 'Twenty-FiveGigE'),
+    ('hge', 'HundredGigE'),
+    ('bagg', 'Bridge-Aggregation'),
+    ('ragg', 'Route-Aggregation'),
+)
+
+_PREFIX_TYPES = dict(IFACE_TYPES)
+
+_PREFIX_RE = re.compile(
+    '(' + '|'.join(re.escape(prefix) for prefix, dummy in IFACE_TYPES) + ')',
+    re.IGNORECASE)
+
+_NUMBER_RE = re.compile(r'[\d/:]+')
+
+# memo of normalize_interface, emptied when it reaches _CACHE_SIZE
+_CACHE = {}
+_CACHE_SIZE = 8192
+
+
+def _get_number(if_name):
+    """Return the interface number (digits, '/' and ':') and the
+    sub interface number of an interface name without a space.
+    """
+    parts = if_name.split('.')
+    if len(parts) == 2:
+        return ''.join(_NUMBER_RE.findall(parts[0])), parts[1].strip()
+    return ''.join(_NUMBER_RE.findall(if_name)), None
+
+
+def normalize_interface(if_name):
+    """Return the normalized interface name, the interface type
+    and the sub interface number of a denormalized interface name.
+
+    Args:
+        if_name (str): interface name, e.g. 'gi1/0/1', 'FortyGigE 1/0/1'
+            or 'Ten-GigabitEthernet1/0/1.5'
+
+    Returns:
+        A tuple (name, type, sub interface number), for example
+        ('GigabitEthernet1/0/1', 'GigabitEthernet', None). The type is
+        None, and the name is returned as given, if the type is unknown.
+    """
+    try:
+        return _CACHE[if_name]
+    except KeyError:
+        pass
+    if len(_CACHE) >= _CACHE_SIZE:
+        _CACHE.clear()
+    result = _CACHE[if_name] = _normalize_interface(if_name)
+    return result
+
+
+def _normalize_interface(if_name):
+    match = _PREFIX_RE.match(if_name)
+    if_type = _PREFIX_TYPES[match.group(1).lower()] if match else None
+
+    number_list = if_name.split(' ')
+    if len(number_list) == 2:
+        sub_num_list = number_list[-1].strip().split('.')
+        number = sub_num_list[0].strip()
+        sub_num = sub_num_list[-1].strip() if len(sub_num_list) == 2 else None
+    else:
+        number, sub_num = _get_number(if_name)
+
+    if if_type:
+        return if_type + number, if_type, sub_num
+    return if_name, None, sub_num
+
+
+def normalize_interface_name(if_name):
+    """Return only the normalized name of an interface,
+    see ``normalize_interface``.
+    """
+    return normalize_interface(if_name)[0]
+
+
+def normalize_interface_full_name(if_name):
+    """Return the normalized name of an interface with its sub
+    interface number, e.g. 'GigabitEthernet1/0/1.5' for 'gi1/0/1.5',
+    so a sub interface is never taken for its parent port.
+    """
+    name, if_type, sub_num = normalize_interface(if_name)
+    if if_type and sub_num:
+        return '{0}.{1}'.format(name, sub_num)
+    return name
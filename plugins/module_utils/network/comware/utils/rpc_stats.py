@@ -0,0 +1,119 @@
+"""Record the RPCs a ``Device`` sends, with their wall time,
+request and reply sizes and XML parse time, to find out where
+module time goes.
+
+Recording is off by default. It is turned on for every module by
+setting ``ENABLED`` to True, or by the ``COMWARE_RPC_STATS``
+environment variable (1, true, yes or on), e.g. with the
+``environment`` keyword of a play. Module results then carry an
+``rpc_stats`` block, see ``RpcStats.summary``.
+"""
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import sys
+
+ENABLED = False
+
+ENV_VAR = 'COMWARE_RPC_STATS'
+
+# files whose frames are skipped when looking for the caller of an RPC
+_INTERNAL_FILES = ('comware.py', 'rpc_stats.py', 'lib.py')
+
+
+def rpc_stats_enabled():
+    """Return whether RPC recording is turned on, by ``ENABLED``
+    or by the ``COMWARE_RPC_STATS`` environment variable.
+    """
+    if ENABLED:
+        return True
+    return os.environ.get(ENV_VAR, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _caller(depth=2):
+    """Return 'Class.method' (or 'file.function') of the nearest
+    frame outside the Device and XML helpers, i.e. the feature class
+    or module that asked for the RPC.
+    """
+    frame = sys._getframe(depth)
+    while frame is not None:
+        filename = os.path.basename(frame.f_code.co_filename)
+        if filename not in _INTERNAL_FILES:
+            owner = frame.f_locals.get('self')
+            if owner is not None:
+                return '%s.%s' % (type(owner).__name__, frame.f_code.co_name)
+            return '%s.%s' % (filename.rsplit('.', 1)[0], frame.f_code.co_name)
+        frame = frame.f_back
+    return 'unknown'
+
+
+def _totals():
+    return {'calls': 0, 'wall_time': 0.0, 'parse_time': 0.0,
+            'request_bytes': 0, 'reply_bytes': 0}
+
+
+def _add(totals, call):
+    totals['calls'] += 1
+    for key in ('wall_time', 'parse_time', 'request_bytes', 'reply_bytes'):
+        totals[key] += call[key]
+
+
+class RpcStats(object):
+    """The RPCs sent through one ``Device``.
+
+    Attributes:
+        calls (list): one dictionary per RPC, in the order they were
+            sent, with the keys 'rpc', 'caller', 'wall_time' and
+            'parse_time' (seconds), 'request_bytes' and 'reply_bytes'.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def record(self, rpc, wall_time, request_bytes, reply_bytes, parse_time=0.0):
+        """Record one RPC and return its entry, so the parse
+        time can be added once the reply has been parsed.
+        """
+        call = {
+            'rpc': rpc,
+            'caller': _caller(),
+            'wall_time': wall_time,
+            'parse_time': parse_time,
+            'request_bytes': request_bytes,
+            'reply_bytes': reply_bytes,
+        }
+        self.calls.append(call)
+        return call
+
+    def summary(self):
+        """Return the recorded RPCs as a dictionary for module results::
+
+            {
+                'total': {'calls': 3, 'wall_time': 0.41, 'parse_time': 0.02,
+                          'request_bytes': 1234, 'reply_bytes': 56789},
+                'by_rpc': {'get': {...}, 'edit_config': {...}},
+                'by_caller': {'Vlan.get_vlan_configs': {...}},
+                'calls': [...]
+            }
+
+        Times are in seconds, rounded to the microsecond.
+        """
+        total = _totals()
+        by_rpc = {}
+        by_caller = {}
+        for call in self.calls:
+            _add(total, call)
+            _add(by_rpc.setdefault(call['rpc'], _totals()), call)
+            _add(by_caller.setdefault(call['caller'], _totals()), call)
+
+        def rounded(entry):
+            return dict((k, round(v, 6) if isinstance(v, float) else v)
+                        for k, v in entry.items())
+
+        return {
+            'total': rounded(total),
+            'by_rpc': dict((k, rounded(v)) for k, v in by_rpc.items()),
+            'by_caller': dict((k, rounded(v)) for k, v in by_caller.items()),
+            'calls': [rounded(call) for call in self.calls],
+        }
@@ -25,26 +25,91 @@ except ImportError:
     HAS_TEXTFSM = False
 
 
+# compiled FSMs keyed by template text, see _checkout_fsm
+_FSM_CACHE = {}
+
+# str and unicode on Python 2
+_STRING_TYPES = (type(''), type(u''))
+
+
+def _checkout_fsm(template_str):
+    """Return an FSM for a template, ready to parse.
+
+    The template is compiled once; the cached FSM is taken out of the
+    cache while in use, so a parse never shares it with another one
+    still running (e.g. a suspended iter_structured_data), and is
+    put back with _checkin_fsm.
+    """
+    if not HAS_TEXTFSM:
+        raise ImportError('textfsm')
+    fsm = _FSM_CACHE.pop(template_str, None)
+    if fsm is None:
+        fsm = textfsm.TextFSM(io.StringIO(template_str))
+    else:
+        fsm.Reset()
+    return fsm
+
+
+def _checkin_fsm(template_str, fsm):
+    _FSM_CACHE[template_str] = fsm
+
+
+def _has_end_state(fsm):
+    return any(rule.new_state == 'End'
+               for rules in fsm.states.values() for rule in rules)
+
+
 def get_structured_data(template_str, rawtxt):
     """Returns structured data given raw text using
     TextFSM templates
     """
-    if not HAS_TEXTFSM:
-        raise ImportError('textfsm')
-    fsm = textfsm.TextFSM(io.StringIO(template_str))
+    fsm = _checkout_fsm(template_str)
 
     # an object is what is being extracted
     # based on the template, it may be one objecst or multiple
     # as is the case with neighbors, interfaces, etc.
     objects = fsm.ParseText(rawtxt)
 
-    structured_data = []
-    for each in objects:
-        index = 0
-        temp = {}
-        for template_value in each:
-            temp[fsm.header[index].lower()] = str(template_value)
-            index += 1
-        structured_data.append(temp)
-
+    header = [name.lower() for name in fsm.header]
+    structured_data = [dict(zip(header, map(str, each))) for each in objects]
+    _checkin_fsm(template_str, fsm)
     return structured_data
+
+
+def iter_structured_data(template_str, rawtxt):
+    """Yield structured data given raw text using TextFSM templates,
+    one dictionary per record as soon as the record is complete.
+
+    Lines are fed to the FSM one at a time with
+    ``ParseText(line, eof=False)``, so records of a long output, or of
+    a file being read, are handed out before the whole text is parsed.
+    Templates with an explicit 'End' state are parsed in one
+    ``ParseText`` call, as only the FSM knows where parsing stops.
+
+    Args:
+        template_str (str): TextFSM template
+        rawtxt: raw text, or an iterable of lines such as a file object
+    """
+    fsm = _checkout_fsm(template_str)
+    header = [name.lower() for name in fsm.header]
+
+    if _has_end_state(fsm):
+        if not isinstance(rawtxt, _STRING_TYPES):
+            rawtxt = ''.join(rawtxt)
+        rawtxt = [rawtxt]
+    elif isinstance(rawtxt, _STRING_TYPES):
+        rawtxt = rawtxt.splitlines()
+
+    done = 0
+    for line in rawtxt:
+        # the newline keeps empty lines, which ParseText('') would skip
+        records = fsm.ParseText(line.rstrip('\r\n') + '\n', eof=False)
+        for each in records[done:]:
+            yield dict(zip(header, map(str, each)))
+        done = len(records)
+
+    # end of text: the implicit EOF records the last entry
+    records = fsm.ParseText('', eof=True)
+    for each in records[done:]:
+        yield dict(zip(header, map(str, each)))
+    _checkin_fsm(template_str, fsm)
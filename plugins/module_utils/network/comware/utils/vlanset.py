@@ -0,0 +1,163 @@
+"""A set of VLAN IDs stored as a 4096-bit bitset, read from and
+written to the range syntax of Comware VLAN lists, e.g. the
+'1-10,20,4000-4094' of PermitVlanList, TaggedVlanList and
+UntaggedVlanList.
+"""
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.module_utils.six import string_types
+
+MIN_VLAN = 1
+MAX_VLAN = 4094
+
+_ALL_BITS = (1 << (MAX_VLAN + 1)) - 1
+
+
+def _iter_bits(bits):
+    """Yield the positions of the set bits of an int, lowest first.
+    """
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class VlanSet(object):
+    """An immutable set of VLAN IDs.
+
+    Bit N of an int stands for VLAN N, so union, intersection,
+    difference and comparison are a few word-sized operations
+    whatever the number of VLANs.
+
+    Args:
+        vlans: OPTIONAL - a VLAN list string such as '1-3,5,8-10',
+            an iterable of VLAN IDs (int or str), or another VlanSet.
+            Spaces are ignored and None or '' is the empty set.
+
+    Raises:
+        ValueError: if a VLAN ID is not a number from 1 to 4094,
+            or a range is reversed or misses a bound, e.g. '1-'.
+    """
+
+    __slots__ = ('_bits',)
+
+    def __init__(self, vlans=None):
+        if vlans is None:
+            self._bits = 0
+        elif isinstance(vlans, VlanSet):
+            self._bits = vlans._bits
+        elif isinstance(vlans, string_types):
+            self._bits = self._parse(vlans)
+        else:
+            bits = 0
+            for vlan in vlans:
+                bits |= 1 << self._check(vlan)
+            self._bits = bits
+
+    @staticmethod
+    def _check(vlan):
+        vlan = int(vlan)
+        if not MIN_VLAN <= vlan <= MAX_VLAN:
+            raise ValueError('VLAN ID %s out of range %s-%s' % (vlan, MIN_VLAN, MAX_VLAN))
+        return vlan
+
+    @classmethod
+    def _parse(cls, text):
+        bits = 0
+        for part in text.replace(' ', '').split(','):
+            if not part:
+                continue
+            first, separator, last = part.partition('-')
+            if separator and not (first and last):
+                raise ValueError('Invalid VLAN range %s' % part)
+            first = cls._check(first)
+            last = cls._check(last) if separator else first
+            if last < first:
+                raise ValueError('Invalid VLAN range %s' % part)
+            # ones from bit 'first' to bit 'last'
+            bits |= ((1 << (last - first + 1)) - 1) << first
+        return bits
+
+    @classmethod
+    def _from_bits(cls, bits):
+        vlan_set = cls.__new__(cls)
+        vlan_set._bits = bits & _ALL_BITS
+        return vlan_set
+
+    def ranges(self):
+        """Yield (first, last) tuples of the consecutive runs of VLANs,
+        lowest first.
+        """
+        bits = self._bits
+        starts = bits & ~(bits << 1)
+        ends = bits & ~(bits >> 1)
+        return zip(_iter_bits(starts), _iter_bits(ends))
+
+    def format(self):
+        """Return the VLAN list string, e.g. '1-3,5,8-10'.
+        """
+        return ','.join(str(first) if first == last else '%d-%d' % (first, last)
+                        for first, last in self.ranges())
+
+    def __str__(self):
+        return self.format()
+
+    def __repr__(self):
+        return 'VlanSet(%r)' % self.format()
+
+    def __iter__(self):
+        return _iter_bits(self._bits)
+
+    def __len__(self):
+        return bin(self._bits).count('1')
+
+    def __bool__(self):
+        return self._bits != 0
+
+    __nonzero__ = __bool__
+
+    def __contains__(self, vlan):
+        try:
+            vlan = int(vlan)
+        except (TypeError, ValueError):
+            return False
+        return MIN_VLAN <= vlan <= MAX_VLAN and bool(self._bits >> vlan & 1)
+
+    def __eq__(self, other):
+        if not isinstance(other, VlanSet):
+            return NotImplemented
+        return self._bits == other._bits
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        return hash(self._bits)
+
+    def __or__(self, other):
+        return self._from_bits(self._bits | VlanSet(other)._bits)
+
+    def __and__(self, other):
+        return self._from_bits(self._bits & VlanSet(other)._bits)
+
+    def __sub__(self, other):
+        return self._from_bits(self._bits & ~VlanSet(other)._bits)
+
+    def __xor__(self, other):
+        return self._from_bits(self._bits ^ VlanSet(other)._bits)
+
+    def union(self, other):
+        return self | other
+
+    def intersection(self, other):
+        return self & other
+
+    def difference(self, other):
+        return self - other
+
+    def issubset(self, other):
+        return not self._bits & ~VlanSet(other)._bits
@@ -5,35 +5,96 @@ XML objects.
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import re
+
+from io import BytesIO
+from xml.sax.saxutils import escape
+
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml.namespaces import NCCONFIG, \
     NCDATA, NCACTION, NETCONFBASE, NETCONFBASE_C, NCDATA_C
 
 try:
+    from lxml import etree
     from lxml.builder import ElementMaker
 
     HAS_LXML = True
 except ImportError:
     HAS_LXML = False
 
+# quotes too, for placeholders in attribute values
+_ESCAPES = {'"': '&quot;'}
+
+# str on Python 3, unicode on Python 2
+_TEXT_TYPE = type(u'')
+
+
+if HAS_LXML:
+    # ElementMaker instances hold no per-document state, so one
+    # of each namespace is shared by every feature
+    _CONFIG_E = ElementMaker(namespace=NCCONFIG, nsmap={None: NCCONFIG})
+    _DATA_E = ElementMaker(namespace=NCDATA, nsmap={None: NCDATA})
+    _ACTION_E = ElementMaker(namespace=NCACTION, nsmap={None: NCACTION})
+    _NC_E = ElementMaker(namespace=NETCONFBASE, nsmap={None: NETCONFBASE})
+else:
+    _CONFIG_E = _DATA_E = _ACTION_E = _NC_E = None
+
 
 def config_element_maker():
-    if HAS_LXML:
-        return ElementMaker(namespace=NCCONFIG, nsmap={None: NCCONFIG})
+    return _CONFIG_E
 
 
 def data_element_maker():
-    if HAS_LXML:
-        return ElementMaker(namespace=NCDATA, nsmap={None: NCDATA})
+    return _DATA_E
 
 
 def action_element_maker():
-    if HAS_LXML:
-        return ElementMaker(namespace=NCACTION, nsmap={None: NCACTION})
+    return _ACTION_E
 
 
 def nc_element_maker():
-    if HAS_LXML:
-        return ElementMaker(namespace=NETCONFBASE, nsmap={None: NETCONFBASE})
+    return _NC_E
+
+
+class XmlTemplate(object):
+    """A pre-serialized XML filter or config document with
+    ``{field}`` placeholders in its text and attribute values.
+
+    The text is split once, so filling it in is a join of the
+    fixed parts and the escaped values, without building and
+    serializing elements. The result can be given to
+    ``Device.get``, ``Device.get_raw`` and ``Device.edit_config``
+    in place of an element.
+
+    Args:
+        text (str): The XML text, for example
+            '<top xmlns="..."><Ifmgr><Interfaces><Interface>'
+            '<Name>{name}</Name><IfIndex/></Interface>...'
+
+    Attributes:
+        fields (tuple): The placeholder names, in document order.
+    """
+
+    _PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+    def __init__(self, text):
+        parts = self._PLACEHOLDER.split(text)
+        self._fixed = parts[0::2]
+        self.fields = tuple(parts[1::2])
+
+    def fill(self, **values):
+        """Return the XML text with every placeholder replaced
+        by its value, escaped for XML. None is the empty string.
+
+        Raises:
+            KeyError: if a placeholder has no value.
+        """
+        fixed = self._fixed
+        out = [fixed[0]]
+        for index, field in enumerate(self.fields):
+            value = values[field]
+            out.append('' if value is None else escape(_TEXT_TYPE(value), _ESCAPES))
+            out.append(fixed[index + 1])
+        return ''.join(out)
 
 
 def config_params(pmap, key_map, value_map=None, E=config_element_maker(), fill_in=True):
@@ -91,9 +152,45 @@ def find_in_config(query, ele):
     return _find_with_ns(query, ele, ns=NCCONFIG)
 
 
+def _field_keys(ns, key_map):
+    """Return a dictionary from qualified XML tag names
+    to the dictionary keys mapped to them, and from
+    qualified names to the plain tag names.
+    """
+    field_keys = {}
+    tags = {}
+    for k, v in key_map.items():
+        qname = '{0}{1}'.format(ns, v)
+        field_keys.setdefault(qname, []).append(k)
+        tags[qname] = v
+    return field_keys, tags
+
+
+def _fields_to_dict(elem, field_keys, tags, value_map):
+    to_dict = {}
+    remaining = len(field_keys)
+    for field in elem.iter(*field_keys):
+        keys = field_keys[field.tag]
+        # only the first descendant with a tag counts
+        if keys[0] in to_dict or field is elem:
+            continue
+        text = field.text
+        value = value_map.get(tags[field.tag], {}).get(text, text)
+        for k in keys:
+            to_dict[k] = value
+        remaining -= 1
+        if not remaining:
+            break
+
+    return to_dict
+
+
 def elem_to_dict(elem, ns, key_map, value_map=None):
     """Convert an XML etree.Element to a desired dictionary
     as specified by the key map and value map.
+
+    The element is walked once, visiting only the tags in
+    the key map; the first descendant with each tag is used.
     Args:
         elem (etree.Element): An ancestor element
             of the tags specified in the key map.
@@ -109,14 +206,10 @@ def elem_to_dict(elem, ns, key_map, value_map=None):
     """
     if value_map is None:
         value_map = {}
-    to_dict = {}
-    for k, v in key_map.items():
-        field = elem.find('.//{0}{1}'.format(ns, v))
-        if field is not None:
-            text = field.text
-            to_dict[k] = value_map.get(v, {}).get(text, text)
-
-    return to_dict
+    if not key_map:
+        return {}
+    field_keys, tags = _field_keys(ns, key_map)
+    return _fields_to_dict(elem, field_keys, tags, value_map)
 
 
 def data_elem_to_dict(elem, key_map, value_map=None):
@@ -125,6 +218,99 @@ def data_elem_to_dict(elem, key_map, value_map=None):
     return elem_to_dict(elem, NCDATA_C, key_map, value_map=value_map)
 
 
+def elems_to_dicts(elems, ns, key_map, value_map=None):
+    """Convert sibling XML table rows to a list of dictionaries,
+    like ``elem_to_dict`` does for each of them, preparing the
+    key map once for all the rows.
+
+    Args:
+        elems: An iterable of row elements, for example
+            the result of ``findall_in_data('Interface', reply)``.
+        ns (string): The namespace to use
+            when searching for XML tags.
+        key_map (dict): A mapping from desired
+            dictionary keys to XML tag names.
+        value_map (dict): A mapping from XML tag names to
+            dictionaries of mappings from XML text
+            values to desired dictionary values.
+    Returns:
+        A list with one dictionary per row, in document order.
+    """
+    if value_map is None:
+        value_map = {}
+    if not key_map:
+        return [{} for dummy in elems]
+    field_keys, tags = _field_keys(ns, key_map)
+    return [_fields_to_dict(elem, field_keys, tags, value_map) for elem in elems]
+
+
+def data_elems_to_dicts(elems, key_map, value_map=None):
+    return elems_to_dicts(elems, NCDATA_C, key_map, value_map=value_map)
+
+
+def iter_rows(source, row_tag, ns=NCDATA_C, key_map=None, value_map=None):
+    """Incrementally parse an XML reply and yield one dictionary
+    per table row, without building the whole tree in memory.
+
+    Each row element is cleared, and dropped from its parent,
+    as soon as it has been converted, so memory use does not
+    grow with the number of rows in the reply.
+
+    Args:
+        source: The reply as bytes, text, or a binary file-like object.
+        row_tag (string): The XML tag of a table row,
+            for example 'Unicast' or 'Interface'.
+        ns (string): The namespace of the row tag and its fields.
+        key_map (dict): OPTIONAL - A mapping from desired
+            dictionary keys to XML tag names. Only these fields
+            are returned. If not given, every leaf field is returned
+            keyed by its XML tag name.
+        value_map (dict): OPTIONAL - A mapping from XML tag names to
+            dictionaries of mappings from XML text
+            values to desired dictionary values.
+
+    Yields:
+        One dictionary per row, built from the row's leaf children.
+    """
+    if value_map is None:
+        value_map = {}
+    r_key_map = None
+    if key_map is not None:
+        r_key_map = dict((v, k) for k, v in key_map.items())
+
+    if not isinstance(source, bytes) and not hasattr(source, 'read'):
+        source = source.encode('utf-8')
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+
+    context = etree.iterparse(source, events=('end',), tag=ns + row_tag, huge_tree=True)
+    for dummy, elem in context:
+        row = {}
+        for field in elem:
+            if len(field) or not isinstance(field.tag, str):
+                continue
+            tag = field.tag.split('}')[-1]
+            if r_key_map is None:
+                key = tag
+            else:
+                key = r_key_map.get(tag)
+                if key is None:
+                    continue
+            text = field.text
+            row[key] = value_map.get(tag, {}).get(text, text)
+
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            del parent[:-1]
+
+        yield row
+
+
+def iter_data_rows(source, row_tag, key_map=None, value_map=None):
+    return iter_rows(source, row_tag, ns=NCDATA_C, key_map=key_map, value_map=value_map)
+
+
 def reverse_value_map(key_map, value_map):
     """Utility function for creating a
     "reverse" value map from a given key map and value map.
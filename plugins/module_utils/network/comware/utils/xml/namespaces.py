@@ -9,3 +9,6 @@ NCCONFIG_C = '{' + NCCONFIG + '}'
 
 NCACTION = "http://www.h3c.com/netconf/action:1.0"
 NCACTION_C = '{' + NCACTION + '}'
+
+H3CBASE = "http://www.h3c.com/netconf/base:1.0"
+H3CBASE_C = '{' + H3CBASE + '}'
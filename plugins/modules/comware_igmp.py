@@ -145,7 +145,7 @@ def main():
         except PYCW7Error as e:
             module.fail_json(descr='There was problem recognizing that interface.',
                              msg=str(e))
-    is_ethernet, is_routed = interface.is_ethernet_is_routed()
+    is_ethernet, is_routed = interface.is_ethernet, interface.is_routed
     if state == 'present':
         if igstate == 'enabled':
             if name == '':
@@ -92,7 +92,7 @@ from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.f
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.file_copy import FileCopy
 
 
-def write_diffs(diff_file, diffs, full_diffs):
+def write_diffs(diff_file, diffs, full_diffs, full_diffs_title):
     with open(diff_file, 'w+') as diff:
         diff.write("#######################################\n")
         diff.write('########## SUMMARY OF DIFFS ###########\n')
@@ -101,7 +101,7 @@ def write_diffs(diff_file, diffs, full_diffs):
         diff.write('\n'.join(diffs))
         diff.write('\n\n\n')
         diff.write("#######################################\n")
-        diff.write('FULL DIFFS AS RETURNED BACK FROM SWITCH\n')
+        diff.write(full_diffs_title + '\n')
         diff.write("#######################################\n")
         diff.write('\n\n')
         diff.write('\n'.join(full_diffs))
@@ -159,7 +159,7 @@ def main():
 
     if diff_file:
         diffs, full_diffs = cfg.compare_config()
-        write_diffs(diff_file, diffs, full_diffs)
+        write_diffs(diff_file, diffs, full_diffs, cfg.full_diffs_title)
     else:
         diffs = 'None.  diff_file param not set in playbook'
 
@@ -27,12 +27,59 @@ notes:
     - When state is set to absent, logical interfaces will be removed
       from the switch, while physical interfaces will be "defaulted"
     - Tunnel interface creation and removal is not currently supported.
+    - With aggregate, only existing interfaces can be configured
+      and only state=present is supported.
 options:
     name:
         description:
-            - Full name of the interface
-        required: true
+            - Full name of the interface.
+              Required unless aggregate is given.
+        required: false
         type: str
+    aggregate:
+        description:
+            - List of interfaces to configure in one task. The
+              interfaces are read with a single get and all the
+              changes are sent in a single edit-config.
+              Mutually exclusive with name.
+        required: false
+        type: list
+        elements: dict
+        aliases: ['config']
+        suboptions:
+            name:
+                description:
+                    - Full name of the interface
+                required: true
+                type: str
+            admin:
+                description:
+                    - Admin state of the interface
+                required: false
+                choices: ['up', 'down']
+                type: str
+            description:
+                description:
+                    - Single line description for the interface
+                required: false
+                type: str
+            type:
+                description:
+                    - Type of interface, i.e. L2 or L3
+                required: false
+                choices: ['bridged', 'routed']
+                type: str
+            duplex:
+                description:
+                    - Duplex of the interface
+                required: false
+                choices: ['auto', 'full']
+                type: str
+            speed:
+                description:
+                    - Speed of the interface in Mbps
+                required: false
+                type: str
     admin:
         description:
             - Admin state of the interface
@@ -88,6 +135,15 @@ EXAMPLES = """
       duplex: auto
       speed: 40000
 
+  - name: 'Configure many interfaces in one task'
+    h3c_open.comware.comware_interface:
+      aggregate:
+        - name: HundredGigE1/0/25
+          description: uplink1
+        - name: HundredGigE1/0/26
+          description: uplink2
+          admin: down
+
 """
 
 import re
@@ -97,13 +153,73 @@ from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.c
 )
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.errors import PYCW7Error
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.errors import InterfaceError
-from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.interface import Interface
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.interface import (
+    Interface, Interfaces
+)
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.ifname import (
+    normalize_interface_name
+)
+
+
+def aggregate_interfaces(module, device):
+    """Configure every interface of the aggregate option with one
+    get of the interface table and one edit-config.
+    """
+    if module.params['state'] != 'present':
+        module.fail_json(msg='Only state=present is supported with aggregate.')
+
+    interfaces = Interfaces(device)
+    proposed = {}
+    try:
+        for item in module.params['aggregate']:
+            params = dict((k, v) for k, v in item.items()
+                          if v is not None and k != 'name')
+            interfaces.param_check(item['name'], **params)
+            proposed[normalize_interface_name(item['name'])] = params
+    except PYCW7Error as exc:
+        module.fail_json(descr='There was problem with the supplied parameters.',
+                         msg=str(exc))
+
+    existing = dict((name, interfaces.get_config(name)) for name in proposed)
+    changes = interfaces.get_deltas(proposed)
+
+    commands = None
+    changed = False
+    end_state = existing
+
+    if changes:
+        interfaces.build(changes, stage=True)
+        commands = device.staged_to_string()
+        if module.check_mode:
+            module.exit_json(changed=True, commands=commands, changes=changes)
+        try:
+            device.execute_staged()
+            end_state = dict((name, interfaces.get_config(name)) for name in proposed)
+        except PYCW7Error as exc:
+            module.fail_json(msg=str(exc),
+                             descr='Error on device execution.')
+        changed = True
+
+    module.exit_json(proposed=proposed, existing=existing, state='present',
+                     commands=commands, changed=changed, changes=changes,
+                     end_state=end_state)
 
 
 def main():
     module = AnsibleModule(
         argument_spec=dict(
-            name=dict(required=True),
+            name=dict(required=False),
+            aggregate=dict(
+                required=False, type='list', elements='dict', aliases=['config'],
+                options=dict(
+                    name=dict(required=True),
+                    admin=dict(choices=['up', 'down']),
+                    description=dict(),
+                    type=dict(choices=['bridged', 'routed']),
+                    duplex=dict(choices=['auto', 'full']),
+                    speed=dict(type='str'),
+                ),
+            ),
             admin=dict(choices=['up', 'down']),
             description=dict(),
             type=dict(choices=['bridged', 'routed']),
@@ -112,13 +228,18 @@ def main():
             state=dict(choices=['present', 'absent', 'default'],
                        default='present'),
         ),
+        mutually_exclusive=[('name', 'aggregate')],
+        required_one_of=[('name', 'aggregate')],
         supports_check_mode=True
     )
 
-    filtered_keys = ('state', 'name')
+    filtered_keys = ('state', 'name', 'aggregate')
 
     device = get_device(module)
 
+    if module.params['aggregate']:
+        aggregate_interfaces(module, device)
+
     name = module.params['name']
     subnum_list = name.split('.')
     state = module.params['state']
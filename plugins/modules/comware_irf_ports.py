@@ -100,19 +100,14 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.comware import (get_device)
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.irf import (
     IrfMember, IrfPort)
-from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.interface import (
-    Interface)
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.ifname import (
+    normalize_interface_name)
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.errors import (
     PYCW7Error, NCTimeoutError, ConnectionClosedError)
 
 
 def convert_iface_list(device, iface_list):
-    converted_list = []
-    for iface_name in iface_list:
-        iface = Interface(device, iface_name)
-        converted_list.append(iface.interface_name)
-
-    return converted_list
+    return [normalize_interface_name(iface_name) for iface_name in iface_list]
 
 
 def safe_fail(module, **kwargs):
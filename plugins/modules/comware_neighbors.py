@@ -23,6 +23,13 @@ options:
         choices: ['cdp', 'lldp']
         default: lldp
         type: str
+    interfaces:
+        description:
+            - Only retrieve neighbors seen on these local interfaces.
+              All neighbors are retrieved when omitted.
+        required: false
+        type: list
+        elements: str
 """
 
 EXAMPLES = '''
@@ -31,6 +38,13 @@ EXAMPLES = '''
           h3c_open.comware.comware_neighbors:
             neigh_type: lldp
 
+        - name: get lldp neighbors of two uplinks
+          h3c_open.comware.comware_neighbors:
+            neigh_type: lldp
+            interfaces:
+              - FortyGigE1/0/1
+              - FortyGigE1/0/2
+
         - name: dump all of results
           debug: var=response.neighbors
 
@@ -55,22 +69,23 @@ def main():
     module = AnsibleModule(
         argument_spec=dict(
             neigh_type=dict(default='lldp', choices=['cdp', 'lldp']),
+            interfaces=dict(required=False, type='list', elements='str'),
         ),
         supports_check_mode=False
     )
 
     device = get_device(module)
     neigh_type = module.params['neigh_type']
+    interfaces = module.params['interfaces']
 
-    neighbors = None
+    response = None
     try:
-        neighbors = Neighbors(device)
+        neighbors = Neighbors(device, interfaces=interfaces)
+        response = getattr(neighbors, neigh_type)
     except PYCW7Error as exe:
         safe_fail(module, msg=str(exe),
                   descr='error getting neighbor info')
 
-    response = getattr(neighbors, neigh_type)
-
     results = dict(neighbors=response)
     safe_exit(module, **results)
 
@@ -217,7 +217,7 @@ def main():
                       descr='There was problem recognizing that interface.',
                       msg=str(exe))
         if name_exist:
-            is_ethernet, is_routed = interface._is_ethernet_is_routed()
+            is_ethernet, is_routed = interface.is_ethernet, interface.is_routed
             if is_ethernet:
                 module.fail_json(msg='The interface mode must be routing.'
                                      '\nPlease configure type first by itself,'
@@ -203,7 +203,7 @@ def main():
 
     if not ospf_interface.iface_exists:
         safe_fail(module, msg='interface does not exist.')
-    is_eth, is_rtd = ospf_interface._is_ethernet_is_routed()
+    is_eth, is_rtd = ospf_interface.is_ethernet, ospf_interface.is_routed
     if not is_rtd:
         safe_fail(module, msg='Interface is not l3 interface. please use interface module set first.')
 
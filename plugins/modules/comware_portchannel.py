@@ -178,6 +178,7 @@ from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.f
     InvalidPortType, AggregationGroupError,
 )
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.errors import PYCW7Error
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.ifname import normalize_interface_name
 
 
 def get_delta(existing, proposed, existing_members, proposed_members,
@@ -255,6 +256,7 @@ def main():
         if not isinstance(members, list):
             module.fail_json(msg='members param must be a list.  YAML format '
                                  + '\nmust be used within the playbook')
+        members = [normalize_interface_name(member) for member in members]
     if state == 'present' and not members:
         module.fail_json(msg='members param required when state=present')
 
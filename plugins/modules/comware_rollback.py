@@ -99,7 +99,7 @@ def write_diffs(diff_file, diffs, full_diffs):
         diff.write('\n'.join(diffs))
         diff.write('\n\n\n')
         diff.write("#######################################\n")
-        diff.write('FULL DIFFS AS RETURNED BACK FROM SWITCH\n')
+        diff.write('COMMANDS THAT APPLY THE DIFFS, IN ORDER\n')
         diff.write("#######################################\n")
         diff.write('\n\n')
         diff.write('\n'.join(full_diffs))
@@ -26,16 +26,69 @@ notes:
       them first.
     - If state=default, the switchport settings will be defaulted.
       That means it will be set as an access port in VLAN 1.
+    - If state=replaced, the layer 2 settings of the given switchports
+      are replaced, settings that are not given being defaulted.
+      Only the settings that differ from the device are sent, and the
+      link type is only changed when it differs.
+    - If state=overridden, the given switchports are configured as with
+      state=replaced and every other switchport, except port channel
+      members, is defaulted.
 options:
     name:
         description:
-            - Full name of the interface
-        required: true
+            - Full name of the interface.
+              Required unless aggregate is given.
+        required: false
         type: str
+    aggregate:
+        description:
+            - List of switchports to configure in one task, used with
+              state=replaced or state=overridden. The switchport tables
+              are read with a single get and all the changes are sent
+              in a single edit-config.
+              Mutually exclusive with name.
+        required: false
+        type: list
+        elements: dict
+        aliases: ['config']
+        suboptions:
+            name:
+                description:
+                    - Full name of the interface
+                required: true
+                type: str
+            link_type:
+                description:
+                    - Layer 2 mode of the interface
+                required: true
+                choices: ['access', 'trunk', 'hybrid']
+                type: str
+            pvid:
+                description:
+                    - Native VLAN ID of a trunk or hybrid port,
+                      VLAN ID of an access port.
+                required: false
+                type: str
+            permitted_vlans:
+                description:
+                    - VLANs allowed on a trunk port, e.g. 1-3,5,8-10
+                required: false
+                type: str
+            untaggedvlan:
+                description:
+                    - Untagged VLANs of a hybrid port, e.g. 1-3,5,8-10
+                required: false
+                type: str
+            taggedvlan:
+                description:
+                    - Tagged VLANs of a hybrid port, e.g. 1-3,5,8-10
+                required: false
+                type: str
     link_type:
         description:
-            - Layer 2 mode of the interface
-        required: true
+            - Layer 2 mode of the interface.
+              Required with name.
+        required: false
         choices: ['access', 'trunk', 'hybrid']
         type: str
     pvid:
@@ -70,7 +123,7 @@ options:
         description:
             - Desired state of the switchport
         required: false
-        choices: ['present', 'default', 'absent']
+        choices: ['present', 'default', 'absent', 'replaced', 'overridden']
         default: present
         type: str
 
@@ -109,14 +162,32 @@ EXAMPLES = """
           state: present
         register: results
 
+      - name: replace the layer 2 settings of two ports
+        h3c_open.comware.comware_switchport:
+          aggregate:
+            - name: HundredGigE1/0/29
+              link_type: trunk
+              permitted_vlans: 1-5
+            - name: HundredGigE1/0/30
+              link_type: access
+              pvid: 3
+          state: replaced
+
 """
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.comware import get_device
-from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.switchport import Switchport
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.switchport import (
+    Switchport, Switchports
+)
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.interface import Interfaces
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.vlan import Vlan
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.features.portchannel import Portchannel
 from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.errors import PYCW7Error
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.ifname import (
+    normalize_interface_name
+)
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.vlanset import VlanSet
 
 
 def safe_fail(module, **kwargs):
@@ -127,45 +198,152 @@ def safe_exit(module, **kwargs):
     module.exit_json(**kwargs)
 
 
+VLAN_LIST_KEYS = ('permitted_vlans', 'untaggedvlan', 'taggedvlan')
+
+
+def check_link_params(module, params):
+    link_type = params.get('link_type')
+    if link_type == 'access':
+        if params.get('permitted_vlans') or params.get('taggedvlan') or params.get(
+                'untaggedvlan'):
+            safe_fail(module,
+                      msg='Access interfaces don\'t take'
+                          + ' permitted vlan lists, untaggedvlan or taggedvlan .')
+    elif link_type == 'trunk':
+        if params.get('untaggedvlan') or params.get('taggedvlan'):
+            safe_fail(module,
+                      msg='Trunk interfaces don\'t take'
+                          + 'untaggedvlan or taggedvlan .')
+    elif link_type == 'hybrid':
+        if params.get('permitted_vlans'):
+            safe_fail(module, msg='Hybrid interface don\'t take '
+                                  + 'permitted vlan lists.')
+
+    for key in VLAN_LIST_KEYS:
+        try:
+            VlanSet(params.get(key))
+        except ValueError as exc:
+            safe_fail(module, msg='Invalid {0}: {1}'.format(key, exc))
+
+
+def replace_switchports(module, device):
+    """Replace the layer 2 settings of many switchports with one get
+    of the switchport tables and one edit-config.
+    """
+    state = module.params['state']
+    keys = ('link_type', 'pvid', 'permitted_vlans', 'untaggedvlan', 'taggedvlan')
+    items = module.params['aggregate'] or [module.params]
+
+    proposed = {}
+    for item in items:
+        check_link_params(module, item)
+        proposed[normalize_interface_name(item['name'])] = dict(
+            (k, item[k]) for k in keys if item.get(k) is not None)
+
+    try:
+        existing_vlans = Vlan(device).get_vlan_configs()
+        pc_list = Portchannel(device, '99', 'bridged').get_all_members()
+        if_configs = Interfaces(device).get_configs()
+    except PYCW7Error as exe:
+        module.fail_json(msg=str(exe),
+                         descr='Error getting vlan, port channel or interface information.')
+
+    pc_members = set(normalize_interface_name(member) for member in pc_list)
+    for name, params in proposed.items():
+        pvid = params.get('pvid')
+        if pvid and pvid not in existing_vlans:
+            safe_fail(module, msg='Vlan {0} does not exist,'.format(pvid)
+                                  + ' Use vlan module to create it.')
+        if name in pc_members:
+            safe_fail(module, msg='{0} is currently part of a port channel.'.format(name)
+                                  + ' Changes should be made to the port channel interface.')
+        if name not in if_configs:
+            safe_fail(module, msg='{0} doesn\'t exist on the device.'.format(name))
+        if if_configs[name].get('type') != 'bridged':
+            safe_fail(module, msg='{0} is not in bridged mode.'.format(name)
+                                  + ' Please use the interface module to change that.')
+
+    switchports = Switchports(device)
+    existing = {}
+    changes = {}
+    try:
+        existing = dict(switchports.get_configs())
+        changes = switchports.get_deltas(proposed, state=state)
+    except PYCW7Error as exe:
+        safe_fail(module, msg=str(exe),
+                  descr='Error getting switchport config.')
+
+    for name in pc_members:
+        changes.pop(name, None)
+
+    commands = None
+    changed = False
+    end_state = existing
+
+    if changes:
+        switchports.build(changes, stage=True)
+        commands = device.staged_to_string()
+        if module.check_mode:
+            safe_exit(module, changed=True, commands=commands, changes=changes)
+        try:
+            device.execute_staged()
+            end_state = switchports.get_configs()
+        except PYCW7Error as exe:
+            safe_fail(module, msg=str(exe),
+                      descr='Error during command execution.')
+        changed = True
+
+    safe_exit(module, proposed=proposed, existing=existing, state=state,
+              commands=commands, changed=changed, changes=changes,
+              end_state=end_state)
+
+
 def main():
     module = AnsibleModule(
         argument_spec=dict(
-            name=dict(required=True),
-            link_type=dict(required=True,
+            name=dict(required=False),
+            aggregate=dict(
+                required=False, type='list', elements='dict', aliases=['config'],
+                options=dict(
+                    name=dict(required=True),
+                    link_type=dict(required=True,
+                                   choices=['access', 'trunk', 'hybrid']),
+                    pvid=dict(type='str'),
+                    permitted_vlans=dict(type='str'),
+                    untaggedvlan=dict(type='str'),
+                    taggedvlan=dict(type='str'),
+                ),
+            ),
+            link_type=dict(required=False,
                            choices=['access', 'trunk', 'hybrid']),
             pvid=dict(type='str'),
             permitted_vlans=dict(type='str'),
             untaggedvlan=dict(type='str'),
             taggedvlan=dict(type='str'),
-            state=dict(choices=['present', 'default', 'absent'],
+            state=dict(choices=['present', 'default', 'absent', 'replaced', 'overridden'],
                        default='present'),
         ),
+        mutually_exclusive=[('name', 'aggregate')],
+        required_one_of=[('name', 'aggregate')],
+        required_by=dict(name='link_type'),
         supports_check_mode=True
     )
 
-    filtered_keys = ('state', 'CHECKMODE', 'name', 'look_for_keys')
+    filtered_keys = ('state', 'CHECKMODE', 'name', 'look_for_keys', 'aggregate')
 
     device = get_device(module)
 
     name = module.params['name']
     state = module.params['state']
     changed = False
+    if state in ('replaced', 'overridden'):
+        replace_switchports(module, device)
+    elif module.params['aggregate']:
+        safe_fail(module, msg='aggregate is only supported with'
+                              + ' state=replaced or state=overridden.')
+
     if state == 'present':
-        if module.params.get('link_type') == 'access':
-            if module.params.get('permitted_vlans') or module.params.get('taggedvlan') or module.params.get(
-                    'untaggedvlan'):
-                safe_fail(module,
-                          msg='Access interfaces don\'t take'
-                              + ' permitted vlan lists, untaggedvlan or taggedvlan .')
-        elif module.params.get('link_type') == 'trunk':
-            if module.params.get('untaggedvlan') or module.params.get('taggedvlan'):
-                safe_fail(module,
-                          msg='Trunk interfaces don\'t take'
-                              + 'untaggedvlan or taggedvlan .')
-        elif module.params.get('link_type') == 'hybrid':
-            if module.params.get('permitted_vlans'):
-                safe_fail(module, msg='Hybrid interface don\'t take '
-                                      + 'permitted vlan lists.')
+        check_link_params(module, module.params)
 
     # Make sure vlan exists
     pvid = module.params.get('pvid')
@@ -228,6 +406,10 @@ def main():
     if state == 'present':
         delta = dict(set(proposed.items()).difference(
             existing.items()))
+        # same VLANs written differently, e.g. '1,2,3' and '1-3'
+        for key in VLAN_LIST_KEYS:
+            if key in delta and VlanSet(delta[key]) == VlanSet(existing.get(key)):
+                delta.pop(key)
         if delta:
             delta['link_type'] = proposed.get('link_type')
             pvid = proposed.get('pvid')
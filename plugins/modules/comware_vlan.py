@@ -115,6 +115,14 @@ def main():
         vlanidlist.append(int(t.group(1)))
         vlanidlist.append(int(t.group(2)))
         f = vlanidlist
+        vlan = Vlan(device, str(f[0]))
+        try:
+            vlan_configs = vlan.get_vlan_configs()
+        except PYCW7Error as e:
+            module.fail_json(msg=str(e),
+                             descr='error getting vlan config')
+
+        deltas = []
         for vlanid in range(f[0], f[1] + 1):
             vlanid = str(vlanid)
             dig = re.compile(r'\d+')
@@ -141,20 +149,20 @@ def main():
             except PYCW7Error as e:
                 module.fail_json(msg=str(e))
 
-            try:
-                existing = vlan.get_config()
-            except PYCW7Error as e:
-                module.fail_json(msg=str(e),
-                                 descr='error getting vlan config')
+            existing = vlan_configs.get(vlanid, {})
 
             if state == 'present':
                 delta = dict(set(proposed.items()).difference(
                     existing.items()))
                 if delta:
-                    vlan.build(stage=True, **delta)
+                    delta['vlanid'] = vlanid
+                    deltas.append(delta)
             elif state == 'absent':
                 if existing:
-                    vlan.remove(stage=True)
+                    deltas.append(dict(vlanid=vlanid))
+
+        if deltas:
+            vlan.build_vlans(deltas, state=state, stage=True)
     else:
         args = dict(vlanid=vlanid, name=name, descr=descr)
         proposed = dict((k, v) for k, v in args.items() if v is not None)
@@ -241,7 +241,7 @@ def main():
 
     if not vrrp_interface.iface_exists:
         module.fail_json(msg='interface does not exist.')
-    is_eth, is_rtd = vrrp_interface._is_ethernet_is_routed()
+    is_eth, is_rtd = vrrp_interface.is_ethernet, vrrp_interface.is_routed
     if not is_rtd:
         module.fail_json(msg='interface needs to be a layer 3 interface')
 
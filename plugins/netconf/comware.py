@@ -75,6 +75,7 @@ class Netconf(NetconfBase):
             "unlock",
             "command",
             "reboot",
+            "get_bulk",
         ]
 
         result["network_api"] = "netconf"
@@ -141,6 +142,23 @@ class Netconf(NetconfBase):
 
         return data
 
+    @ensure_ncclient
+    def get_bulk(self, filter=None):
+        """Comware get-bulk RPC, which returns at most ``count`` rows of
+        a table, starting after the row whose index is in the filter.
+        Args:
+            filter: ('subtree', xml text) filter. The table element
+                carries the ``count`` attribute and the row element the
+                index of the last row already retrieved, if any.
+        Returns:
+            xml text of the reply
+        """
+        if filter is not None and not isinstance(filter, tuple):
+            filter = tuple(filter)
+        rpc = '<get-bulk xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"/>'
+        rsp = self.execute(self.dispatch, [rpc], dict(filter=filter))
+        return rsp
+
     def edit_config(self, config, target='running'):
         """Send a NETCONF edit_config XML object to the device.
         Args:
@@ -0,0 +1,140 @@
+"""Micro-benchmark of the interface-name normalizer.
+
+Compares ``utils.ifname.normalize_interface`` with the startswith chain
+Interface._iface_type used before, on a list of 10k names, and checks
+that both give the same result for every name.
+
+Run from the collection root:
+
+    python tests/benchmarks/bench_ifname.py
+"""
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import importlib.util
+import os
+import random
+import timeit
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+IFNAME = os.path.join(ROOT, 'plugins', 'module_utils', 'network', 'comware', 'utils', 'ifname.py')
+
+spec = importlib.util.spec_from_file_location('ifname', IFNAME)
+ifname = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ifname)
+
+
+def legacy_get_number(if_name):
+    digits = ''
+    subnumlist = if_name.split('.')
+    if len(subnumlist) == 2:
+        subnum = subnumlist[-1].strip()
+        if_name = subnumlist[0].strip()
+        for char in if_name:
+            if char.isdigit() or char == '/' or char == ':':
+                digits += char
+    else:
+        for char in if_name:
+            if char.isdigit() or char == '/' or char == ':':
+                digits += char
+        subnum = None
+    return digits, subnum
+
+
+def legacy_iface_type(if_name):
+    if if_name.lower().startswith('gi'):
+        if_type = 'GigabitEthernet'
+    elif if_name.lower().startswith('ten'):
+        if_type = 'Ten-GigabitEthernet'
+    elif if_name.lower().startswith('fo'):
+        if_type = 'FortyGigE'
+    elif if_name.lower().startswith('vl'):
+        if_type = 'Vlan-interface'
+    elif if_name.lower().startswith('vs'):
+        if_type = 'Vsi-interface'
+    elif if_name.lower().startswith('lo'):
+        if_type = 'LoopBack'
+    elif if_name.lower().startswith('br'):
+        if_type = 'Bridge-Aggregation'
+    elif if_name.lower().startswith('ro'):
+        if_type = 'Route-Aggregation'
+    elif if_name.lower().startswith('tu'):
+        if_type = 'Tunnel'
+    elif if_name.lower().startswith('twentygig'):
+        if_type = 'TwentyGigE'
+    elif if_name.lower().startswith('twenty-fivegig'):
+        if_type = 'Twenty-FiveGigE'
+    elif if_name.lower().startswith('hu'):
+        if_type = 'HundredGigE'
+    else:
+        if_type = None
+
+    number_list = if_name.split(' ')
+    if len(number_list) == 2:
+        iface_num = number_list[-1].strip()
+        sub_num_list = iface_num.split('.')
+        if len(sub_num_list) == 2:
+            sub_num = sub_num_list[-1].strip()
+            number = sub_num_list[0].strip()
+        else:
+            number = sub_num_list[0].strip()
+            sub_num = None
+    else:
+        number, sub_num = legacy_get_number(if_name)
+
+    if if_type:
+        proper_interface = if_type + number
+    else:
+        proper_interface = if_name
+
+    return proper_interface, if_type, sub_num
+
+
+def gen_names(count, seed=1):
+    rnd = random.Random(seed)
+    forms = ['gi', 'GigabitEthernet', 'ten', 'Ten-GigabitEthernet', 'FortyGigE', 'fo',
+             'Twenty-FiveGigE', 'TwentyGigE', 'hu', 'HundredGigE', 'vlan', 'Vlan-interface',
+             'LoopBack', 'Bridge-Aggregation', 'Route-Aggregation', 'Tunnel', 'vsi', 'mgmt']
+    names = []
+    for dummy in range(count):
+        form = rnd.choice(forms)
+        number = '{0}/0/{1}'.format(rnd.randint(1, 4), rnd.randint(1, 48))
+        if form in ('vlan', 'Vlan-interface', 'LoopBack', 'Tunnel', 'vsi',
+                    'Bridge-Aggregation', 'Route-Aggregation'):
+            number = str(rnd.randint(1, 4094))
+        if rnd.random() < 0.1:
+            number += '.{0}'.format(rnd.randint(1, 100))
+        sep = ' ' if rnd.random() < 0.2 else ''
+        names.append(form + sep + number)
+    return names
+
+
+def main():
+    names = gen_names(10000)
+
+    mismatches = [name for name in names if legacy_iface_type(name) != ifname.normalize_interface(name)]
+    print('names: {0}, distinct: {1}, mismatches: {2}'.format(
+        len(names), len(set(names)), len(mismatches)))
+
+    def run_legacy():
+        for name in names:
+            legacy_iface_type(name)
+
+    def run_cold():
+        ifname._CACHE.clear()
+        for name in names:
+            ifname.normalize_interface(name)
+
+    def run_warm():
+        for name in names:
+            ifname.normalize_interface(name)
+
+    for label, func in (('startswith chain', run_legacy),
+                        ('regex, cold cache', run_cold),
+                        ('regex, warm cache', run_warm)):
+        best = min(timeit.repeat(func, number=1, repeat=5))
+        print('{0:<20} {1:8.2f} ms / 10k names'.format(label, best * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,394 @@
+"""RPC budget of the comware_* modules.
+
+Runs the main path of each module against a ComwareSimulator (see
+comware_sim.py) filled at three scales, and reports per run:
+
+- RPCs sent to the device, and request/reply bytes
+- serialize: time spent building request XML (xml_to_string)
+- parse: time spent parsing replies (from the rpc_stats of the result)
+- cpu: process time of the whole module run
+- peak: peak memory allocated by the run (tracemalloc)
+
+The RPC count of each run is checked against rpc_budget.json, next to
+this file; a run that sends more RPCs than its budget fails the
+benchmark, e.g. a module that starts reading one VLAN per get. Runs
+without a budget are reported as 'new'. After an intended change of RPC
+count, update the budgets with --update and commit the file.
+
+Needs ansible, the ansible.netcommon collection and lxml, and must be
+run from the collection in its ansible_collections/h3c_open/comware
+tree:
+
+    python tests/benchmarks/bench_rpc_budget.py
+    python tests/benchmarks/bench_rpc_budget.py --scale small --case comware_vlan
+    python tests/benchmarks/bench_rpc_budget.py --update
+
+With --record DIR, the RPCs of each run are also written to
+DIR/<case>-<scale>.jsonl (see replay.py); with --replay DIR, runs are
+answered from those recordings instead of the simulator, e.g. from
+recordings made against a real device. Some modules order request
+elements by set iteration, so both run with PYTHONHASHSEED=0 to send
+the same requests.
+"""
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.normpath(os.path.join(HERE, '..', '..'))
+COLLECTIONS = os.path.normpath(os.path.join(ROOT, '..', '..', '..'))
+BUDGET_FILE = os.path.join(HERE, 'rpc_budget.json')
+
+sys.path.insert(0, HERE)
+if os.path.basename(COLLECTIONS) == 'ansible_collections':
+    sys.path.insert(0, os.path.dirname(COLLECTIONS))
+
+from comware_sim import ComwareSimulator  # noqa: E402
+
+PACKAGE = 'ansible_collections.h3c_open.comware.plugins'
+
+try:
+    from ansible.module_utils import basic
+    from ansible.module_utils.common.text.converters import to_bytes
+    comware = importlib.import_module(PACKAGE + '.module_utils.network.comware.comware')
+    replay = importlib.import_module(PACKAGE + '.module_utils.network.comware.replay')
+    rpc_stats = importlib.import_module(PACKAGE + '.module_utils.network.comware.utils.rpc_stats')
+except ImportError as exc:
+    sys.exit('%s\nRun from the collection in its ansible_collections/h3c_open/comware '
+             'tree, with ansible and ansible.netcommon installed.' % exc)
+
+SCALES = {
+    'small': dict(vlans=10, interfaces=48, macs=100, lldp_neighbors=10, lagg_groups=2),
+    'medium': dict(vlans=1000, interfaces=480, macs=10000, lldp_neighbors=100, lagg_groups=8),
+    'large': dict(vlans=4000, interfaces=1008, macs=100000, lldp_neighbors=400, lagg_groups=32),
+}
+
+
+def _ports(sim, count=None):
+    """Return the names of the GigabitEthernet ports that are not in
+    a Bridge-Aggregation group.
+    """
+    members = set(row['IfIndex'] for row in sim.table('LAGG', 'LAGGMembers').values())
+    names = [name for index, name in sim.interface_names().items()
+             if name.startswith('GigabitEthernet') and index not in members]
+    return names[:count]
+
+
+def vlan_single(sim, size):
+    return {'vlanid': '2', 'name': 'bench', 'descr': 'bench'}
+
+
+def vlan_range(sim, size):
+    # the upper half of the range has to be created
+    for vlan in range(size['vlans'] // 2 + 1, size['vlans'] + 1):
+        sim.delete_row('VLAN', 'VLANs', {'ID': str(vlan)})
+    return {'vlanid': '1-%d' % size['vlans'], 'name': 'bench', 'descr': 'bench'}
+
+
+def interface_single(sim, size):
+    return {'name': _ports(sim, 1)[0], 'description': 'bench', 'admin': 'down'}
+
+
+def interface_aggregate(sim, size):
+    return {'aggregate': [{'name': name, 'description': 'bench %s' % name}
+                          for name in _ports(sim)]}
+
+
+def switchport_single(sim, size):
+    return {'name': _ports(sim, 1)[0], 'link_type': 'trunk',
+            'permitted_vlans': '1-%d' % size['vlans']}
+
+
+def switchport_replaced(sim, size):
+    return {'state': 'replaced',
+            'aggregate': [{'name': name, 'link_type': 'trunk',
+                           'permitted_vlans': '1-%d' % size['vlans']}
+                          for name in _ports(sim)]}
+
+
+def portchannel(sim, size):
+    ports = _ports(sim)
+    return {'group': '100', 'members': ports[-2:], 'type': 'bridged', 'mode': 'dynamic'}
+
+
+def mtu(sim, size):
+    return {'name': _ports(sim, 1)[0], 'jumboframe': '9216'}
+
+
+def iface_stp(sim, size):
+    return {'name': _ports(sim, 1)[0], 'edgedport': 'true', 'tc_restriction': 'true'}
+
+
+def lldp_interface(sim, size):
+    return {'name': _ports(sim, 1)[0], 'interface_enable': 'disabled'}
+
+
+def ipinterface(sim, size):
+    sim.add_interface('Vlan-interface2', port_layer='2')
+    return {'name': 'Vlan-interface2', 'addr': '192.0.2.1', 'mask': '24'}
+
+
+def lldp_global(sim, size):
+    return {'state': 'enabled'}
+
+
+def stp(sim, size):
+    return {'mode': 'RSTP', 'bpdu': 'true'}
+
+
+def lacp(sim, size):
+    return {'priorityID': '100', 'state': 'present'}
+
+
+def save(sim, size):
+    return {'filename': 'bench.cfg'}
+
+
+def command(sim, size):
+    return {'type': 'display', 'command': ['display interface brief']}
+
+
+def no_params(sim, size):
+    return {}
+
+
+def lldp_neighbors(sim, size):
+    return {'neigh_type': 'lldp'}
+
+
+# (case name, module, params for a populated simulator)
+CASES = [
+    ('comware_vlan/single', 'comware_vlan', vlan_single),
+    ('comware_vlan/range', 'comware_vlan', vlan_range),
+    ('comware_interface/single', 'comware_interface', interface_single),
+    ('comware_interface/aggregate', 'comware_interface', interface_aggregate),
+    ('comware_switchport/single', 'comware_switchport', switchport_single),
+    ('comware_switchport/replaced', 'comware_switchport', switchport_replaced),
+    ('comware_portchannel', 'comware_portchannel', portchannel),
+    ('comware_mtu', 'comware_mtu', mtu),
+    ('comware_iface_stp', 'comware_iface_stp', iface_stp),
+    ('comware_lldp_interface', 'comware_lldp_interface', lldp_interface),
+    ('comware_ipinterface', 'comware_ipinterface', ipinterface),
+    ('comware_lldp_global', 'comware_lldp_global', lldp_global),
+    ('comware_stp', 'comware_stp', stp),
+    ('comware_lacp', 'comware_lacp', lacp),
+    ('comware_save', 'comware_save', save),
+    ('comware_command', 'comware_command', command),
+    ('comware_intfstate', 'comware_intfstate', no_params),
+    ('comware_neighbors', 'comware_neighbors', lldp_neighbors),
+    ('comware_facts', 'comware_facts', no_params),
+]
+
+
+def _file_name(case, scale):
+    return '%s-%s.jsonl' % (case.replace('/', '-'), scale)
+
+
+@contextlib.contextmanager
+def _device(connection):
+    """Give every AnsibleModule created in the block the connection,
+    see get_connection and get_capabilities.
+    """
+    init = basic.AnsibleModule.__init__
+
+    def patched_init(module, *args, **kwargs):
+        init(module, *args, **kwargs)
+        module._comware_connection = connection
+        module._comware_capabilities = {'network_api': 'netconf'}
+
+    basic.AnsibleModule.__init__ = patched_init
+    try:
+        yield
+    finally:
+        basic.AnsibleModule.__init__ = init
+
+
+@contextlib.contextmanager
+def _timed_serialize(times):
+    xml_to_string = comware.xml_to_string
+
+    def timed(*args, **kwargs):
+        start = time.process_time()
+        try:
+            return xml_to_string(*args, **kwargs)
+        finally:
+            times.append(time.process_time() - start)
+
+    comware.xml_to_string = timed
+    try:
+        yield
+    finally:
+        comware.xml_to_string = xml_to_string
+
+
+def _connection(case, scale, sim, args):
+    if args.replay:
+        return replay.ReplayConnection(os.path.join(args.replay, _file_name(case, scale)))
+    connection = sim.connection()
+    if args.record:
+        path = os.path.join(args.record, _file_name(case, scale))
+        if os.path.exists(path):
+            os.remove(path)
+        replay.record_connection(connection, path)
+    return connection
+
+
+def _run_module(module_name, params, connection, trace_memory=False):
+    """Run the main() of a module once and return
+    (module result, serialize times, cpu time, peak memory).
+    """
+    module = importlib.import_module('%s.modules.%s' % (PACKAGE, module_name))
+    basic._ANSIBLE_ARGS = to_bytes(json.dumps({'ANSIBLE_MODULE_ARGS': params}))
+    serialize = []
+    output = io.StringIO()
+    peak = 0
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.process_time()
+    try:
+        with _device(connection), _timed_serialize(serialize), \
+                contextlib.redirect_stdout(output):
+            try:
+                module.main()
+            except SystemExit:
+                pass
+    finally:
+        cpu = time.process_time() - start
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    try:
+        result = json.loads(output.getvalue())
+    except ValueError:
+        result = {'failed': True, 'msg': output.getvalue()[-500:]}
+    return result, serialize, cpu, peak
+
+
+def run_case(case, module_name, make_params, scale, args):
+    """Run one case at one scale and return its measurements.
+    """
+    size = SCALES[scale]
+    runs = {}
+    # a second run measures memory, as tracemalloc slows down the first
+    for trace_memory in (False, True):
+        sim = ComwareSimulator().populate(**size)
+        params = make_params(sim, size)
+        if trace_memory and not args.replay:
+            connection = sim.connection()
+        else:
+            connection = _connection(case, scale, sim, args)
+        runs[trace_memory] = _run_module(module_name, params, connection, trace_memory)
+
+    result, serialize, cpu, dummy = runs[False]
+    peak = runs[True][3]
+    total = result.get('rpc_stats', {}).get('total', {})
+    return {
+        'case': case,
+        'scale': scale,
+        'failed': bool(result.get('failed')),
+        'msg': result.get('msg', ''),
+        'changed': bool(result.get('changed')),
+        'rpcs': total.get('calls', 0),
+        'request_bytes': total.get('request_bytes', 0),
+        'reply_bytes': total.get('reply_bytes', 0),
+        'serialize': sum(serialize),
+        'parse': total.get('parse_time', 0.0),
+        'cpu': cpu,
+        'peak': peak,
+    }
+
+
+def _budget_status(run, budget):
+    if run['failed']:
+        return 'ERROR'
+    limit = budget.get(run['case'], {}).get(run['scale'])
+    if limit is None:
+        return 'new'
+    if run['rpcs'] > limit:
+        return 'OVER %d' % limit
+    return 'ok'
+
+
+def _print_run(run, status):
+    print('%-30s %-7s %5d %10d %11d %9.3f %7.3f %7.3f %8.1f  %s' % (
+        run['case'], run['scale'], run['rpcs'], run['request_bytes'], run['reply_bytes'],
+        run['serialize'], run['parse'], run['cpu'], run['peak'] / 1048576.0, status))
+    if run['failed']:
+        print('    %s' % run['msg'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='RPC budget of the comware_* modules')
+    parser.add_argument('--scale', action='append', choices=sorted(SCALES),
+                        help='scale to run, repeatable (default: all)')
+    parser.add_argument('--case', action='append',
+                        help='case or module to run, repeatable (default: all)')
+    parser.add_argument('--update', action='store_true',
+                        help='write the RPC counts of this run to %s' % os.path.basename(BUDGET_FILE))
+    parser.add_argument('--record', metavar='DIR', help='record the RPCs of each run to DIR')
+    parser.add_argument('--replay', metavar='DIR', help='answer the runs from recordings in DIR')
+    args = parser.parse_args()
+
+    if (args.record or args.replay) and os.environ.get('PYTHONHASHSEED') != '0':
+        # recorded requests are matched as text, see the module docstring
+        env = dict(os.environ, PYTHONHASHSEED='0')
+        os.execve(sys.executable, [sys.executable] + sys.argv, env)
+
+    scales = [scale for scale in ('small', 'medium', 'large') if scale in (args.scale or SCALES)]
+    cases = [case for case in CASES
+             if not args.case or case[0] in args.case or case[1] in args.case]
+
+    # collection modules without a case, to keep the coverage visible
+    covered = set(module_name for dummy, module_name, dummy in CASES)
+    uncovered = sorted(name[:-3] for name in os.listdir(os.path.join(ROOT, 'plugins', 'modules'))
+                       if name.startswith('comware_') and name.endswith('.py')
+                       and name[:-3] not in covered)
+
+    budget = {}
+    if os.path.exists(BUDGET_FILE):
+        with open(BUDGET_FILE) as budget_file:
+            budget = json.load(budget_file)
+
+    rpc_stats.ENABLED = True
+    print('%-30s %-7s %5s %10s %11s %9s %7s %7s %8s  %s' % (
+        'case', 'scale', 'rpcs', 'req bytes', 'reply bytes', 'serialize', 'parse',
+        'cpu', 'peak MiB', 'budget'))
+    failures = 0
+    for case, module_name, make_params in cases:
+        for scale in scales:
+            run = run_case(case, module_name, make_params, scale, args)
+            status = _budget_status(run, budget)
+            if status not in ('ok', 'new'):
+                failures += 1
+            _print_run(run, status)
+            if args.update and not run['failed']:
+                budget.setdefault(case, {})[scale] = run['rpcs']
+
+    if uncovered:
+        print('\nno case: %s' % ', '.join(uncovered))
+
+    if args.update:
+        with open(BUDGET_FILE, 'w') as budget_file:
+            json.dump(budget, budget_file, indent=2, sort_keys=True)
+            budget_file.write('\n')
+        print('\nbudgets written to %s' % BUDGET_FILE)
+
+    if failures:
+        print('\n%d run(s) failed or went over their RPC budget' % failures)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Benchmark of utils/templates/cli.py.
+
+Parses realistic 'display' outputs with the TextFSM templates used by
+the VRRP and VXLAN tunnel features, comparing a fresh TextFSM per call (the previous get_structured_data),
+the compiled-template cache (Reset before each ParseText) and the
+streaming iter_structured_data. Results of all three are checked to be
+identical.
+
+Run from the collection root (needs textfsm):
+
+    python tests/benchmarks/bench_textfsm.py
+"""
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import importlib.util
+import io
+import os
+import timeit
+
+import textfsm
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+CLI = os.path.join(ROOT, 'plugins', 'module_utils', 'network', 'comware', 'utils', 'templates', 'cli.py')
+
+spec = importlib.util.spec_from_file_location('cli', CLI)
+cli = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(cli)
+
+# same templates as features/vrrp.py and features/vxlan.py
+VRRP_TMPL = r"""Value VRID (\d+)
+Value PRIORITY (\d+)
+Value PREEMPT (Yes|No)
+Value VIP (((\d+.){3}\d+))
+Value ADMIN (\w+)
+
+
+Start
+  ^\s+Interface -> TABLE
+
+TABLE
+  ^\s+VRID\s+:\s+${VRID}
+  ^\s+Admin Status\s+:\s+${ADMIN}
+  ^\s+Config Pri\s+:\s+${PRIORITY}
+  ^\s+Preempt Mode\s+:\s+${PREEMPT}
+  ^\s+Virtual IP\s+:\s+${VIP} -> Record Start
+"""
+
+TUNNEL_TMPL = r"""Value MODE (\w+)
+Value SRC (((\d+.){3}\d+))
+Value DEST (((\d+.){3}\d+))
+
+Start
+  ^interface Tunnel\d+\s+mode\s+${MODE}
+  ^\s+source\s${SRC}
+  ^\s+destination\s${DEST} -> Record
+"""
+
+VRRP_GROUP = """ Interface Vlan-interface{0}
+   VRID           : {1}               Adver Timer  : 100
+   Admin Status   : Up                State        : Master
+   Config Pri     : 110               Running Pri  : 110
+   Preempt Mode   : Yes               Delay Time   : 0
+   Auth Type      : None
+   Version        : 3
+   Virtual IP     : 10.{2}.{3}.254
+   Virtual MAC    : 0000-5e00-01{4:02x}
+   Master IP      : 10.{2}.{3}.1
+"""
+
+TUNNEL = """interface Tunnel{0} mode vxlan
+ source 10.0.0.1
+ destination 10.1.{1}.{2}
+"""
+
+
+def display_vrrp(groups):
+    lines = ['<HOST>display vrrp verbose',
+             'IPv4 Virtual Router Information:',
+             ' Running mode : Standard']
+    for num in range(groups):
+        lines.append(VRRP_GROUP.format(num + 1, num % 255 + 1, num // 256, num % 256, num % 256))
+    lines.append('<HOST>')
+    return '\n'.join(lines)
+
+
+def display_tunnel(num):
+    return '\n'.join(['<HOST>display current-configuration interface Tunnel {0}'.format(num),
+                      '#', TUNNEL.format(num, num // 256, num % 256), '#', 'return', '<HOST>'])
+
+
+def legacy_get_structured_data(template_str, rawtxt):
+    fsm = textfsm.TextFSM(io.StringIO(template_str))
+    objects = fsm.ParseText(rawtxt)
+    structured_data = []
+    for each in objects:
+        index = 0
+        temp = {}
+        for template_value in each:
+            temp[fsm.header[index].lower()] = str(template_value)
+            index += 1
+        structured_data.append(temp)
+    return structured_data
+
+
+def bench(label, template, outputs):
+    for output in outputs[:50]:
+        expected = legacy_get_structured_data(template, output)
+        assert cli.get_structured_data(template, output) == expected
+        assert list(cli.iter_structured_data(template, output)) == expected
+
+    def run(func):
+        def inner():
+            for output in outputs:
+                for dummy in func(template, output):
+                    pass
+        return inner
+
+    print(label)
+    for name, func in (('fresh TextFSM per call', legacy_get_structured_data),
+                       ('cached template', cli.get_structured_data),
+                       ('cached, streaming', cli.iter_structured_data)):
+        best = min(timeit.repeat(run(func), number=1, repeat=5))
+        print('  {0:<24} {1:8.2f} ms'.format(name, best * 1000))
+
+
+def main():
+    bench('1000 x tunnel config (one record each)', TUNNEL_TMPL,
+          [display_tunnel(num) for num in range(1, 1001)])
+    bench('100 x display vrrp verbose (4 groups each)', VRRP_TMPL,
+          [display_vrrp(4) for dummy in range(100)])
+    bench('1 x display vrrp verbose (4000 groups)', VRRP_TMPL,
+          [display_vrrp(4000)])
+
+
+if __name__ == '__main__':
+    main()
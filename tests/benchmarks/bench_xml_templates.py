@@ -0,0 +1,102 @@
+"""Benchmark of the element makers and XmlTemplate in utils/xml/lib.py.
+
+Builds and serializes 10k per-interface Ifmgr filters, like
+Interface._get_iface_info sends, with a new ElementMaker per call (the
+element makers before), with the shared element maker, and by filling
+a prebuilt XmlTemplate. The filters of all three are checked to parse
+to the same document.
+
+Run from the collection root (needs lxml):
+
+    python tests/benchmarks/bench_xml_templates.py
+"""
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import importlib.util
+import os
+import sys
+import timeit
+
+from lxml import etree
+from lxml.builder import ElementMaker
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+XML = os.path.join(ROOT, 'plugins', 'module_utils', 'network', 'comware', 'utils', 'xml')
+PACKAGE = 'ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.xml'
+
+
+def load(name):
+    spec = importlib.util.spec_from_file_location(PACKAGE + '.' + name, os.path.join(XML, name + '.py'))
+    module = importlib.util.module_from_spec(spec)
+    # lib.py imports namespaces.py by its collection name
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+namespaces = load('namespaces')
+lib = load('lib')
+
+NCDATA = namespaces.NCDATA
+
+IFACE_INFO_FILTER = lib.XmlTemplate(
+    '<top xmlns="' + NCDATA + '"><Ifmgr><Interfaces><Interface>'
+    '<Name>{name}</Name><IfIndex/><PortLayer/>'
+    '</Interface></Interfaces></Ifmgr></top>')
+
+NAMES = ['GigabitEthernet%d/0/%d' % (number // 48 + 1, number % 48 + 1) for number in range(10000)]
+
+
+def build(E, name):
+    return etree.tostring(E.top(
+        E.Ifmgr(
+            E.Interfaces(
+                E.Interface(
+                    E.Name(name),
+                    E.IfIndex(),
+                    E.PortLayer()
+                )
+            )
+        )
+    ), encoding='unicode')
+
+
+def legacy_filter(name):
+    return build(ElementMaker(namespace=NCDATA, nsmap={None: NCDATA}), name)
+
+
+def shared_filter(name):
+    return build(lib.data_element_maker(), name)
+
+
+def template_filter(name):
+    return IFACE_INFO_FILTER.fill(name=name)
+
+
+def canonical(text):
+    return etree.tostring(etree.fromstring(text), method='c14n')
+
+
+def main():
+    for name in NAMES[:50] + ['Tunnel<1> & "2"']:
+        expected = canonical(legacy_filter(name))
+        assert canonical(shared_filter(name)) == expected
+        assert canonical(template_filter(name)) == expected
+
+    def run(func):
+        def inner():
+            for name in NAMES:
+                func(name)
+        return inner
+
+    print('10k Ifmgr/Interfaces filters by name')
+    for label, func in (('new ElementMaker (before)', legacy_filter),
+                        ('shared ElementMaker', shared_filter),
+                        ('XmlTemplate.fill', template_filter)):
+        best = min(timeit.repeat(run(func), number=1, repeat=5))
+        print('  {0:<26} {1:8.2f} ms'.format(label, best * 1000))
+
+
+if __name__ == '__main__':
+    main()
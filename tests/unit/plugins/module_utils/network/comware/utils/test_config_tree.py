@@ -0,0 +1,85 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.config_tree import (
+    ConfigTree, diff_config, diff_summary
+)
+
+CONFIG = """<H3C>display current-configuration
+#
+interface GigabitEthernet1/0/1
+ port link-mode route
+ description parent
+#
+interface GigabitEthernet1/0/1.5
+ description sub
+ vlan-type dot1q vid 5
+#
+return
+"""
+
+
+def test_interface_and_sub_interface_sections():
+    tree = ConfigTree(CONFIG)
+
+    parent = tree.interface('GigabitEthernet1/0/1')
+    sub = tree.interface('GigabitEthernet1/0/1.5')
+
+    assert parent.line == 'interface GigabitEthernet1/0/1'
+    assert parent.include('description') == [' description parent']
+    assert sub.line == 'interface GigabitEthernet1/0/1.5'
+    assert sub.include('description') == [' description sub']
+
+
+def test_interface_lookup_normalizes_names():
+    tree = ConfigTree(CONFIG)
+
+    assert tree.interface('gi1/0/1') is tree.interface('GigabitEthernet1/0/1')
+    assert tree.interface('gi1/0/1.5') is tree.interface('GigabitEthernet1/0/1.5')
+    assert tree.interface('gi1/0/1.6') is None
+
+
+def test_diff_config_replaces_single_value_commands():
+    old = ConfigTree("interface GigabitEthernet1/0/2\n description old\n port link-type access\n")
+    new = ConfigTree("interface GigabitEthernet1/0/2\n description new\n port link-type access\n")
+
+    assert diff_config(old, new) == [
+        'interface GigabitEthernet1/0/2',
+        'description new',
+        'quit',
+    ]
+    assert diff_summary(old, new) == [
+        ' interface GigabitEthernet1/0/2',
+        '- description old',
+        '+ description new',
+    ]
+
+
+def test_diff_config_undoes_removed_lines():
+    old = ConfigTree("interface GigabitEthernet1/0/2\n description old\n port link-type trunk\n"
+                     " port trunk permit vlan 10\n undo shutdown\n#\nvlan 10\n")
+    new = ConfigTree("interface GigabitEthernet1/0/2\n")
+
+    assert diff_config(old, new) == [
+        'undo vlan 10',
+        'interface GigabitEthernet1/0/2',
+        'undo description',
+        'undo port link-type',
+        'undo port trunk permit vlan 10',
+        'shutdown',
+        'quit',
+    ]
+
+
+def test_diff_config_never_undoes_physical_interfaces():
+    old = ConfigTree(CONFIG.replace('return', 'interface Vlan-interface10\n ip address 10.0.0.1 24\n'))
+    new = ConfigTree("")
+
+    assert diff_config(old, new) == [
+        'interface GigabitEthernet1/0/1',
+        'undo port link-mode',
+        'undo description',
+        'quit',
+        'undo interface GigabitEthernet1/0/1.5',
+        'undo interface Vlan-interface10',
+    ]
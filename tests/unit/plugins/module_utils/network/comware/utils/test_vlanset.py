@@ -0,0 +1,22 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.h3c_open.comware.plugins.module_utils.network.comware.utils.vlanset import (
+    VlanSet
+)
+
+
+def test_parse_and_format():
+    vlans = VlanSet(' 8-10, 1-3,5,,2 ')
+
+    assert vlans.format() == '1-3,5,8-10'
+    assert list(vlans) == [1, 2, 3, 5, 8, 9, 10]
+    assert VlanSet('4094') == VlanSet([4094])
+
+
+@pytest.mark.parametrize('text', ['1-', '-10', '-', '3-1', '0', '4095', '1-4095', 'a', '1-2-3'])
+def test_parse_rejects_invalid_lists(text):
+    with pytest.raises(ValueError):
+        VlanSet(text)